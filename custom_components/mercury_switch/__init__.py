@@ -3,24 +3,49 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
+    from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from homeassistant.const import CONF_HOST
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN, PLATFORMS, SCAN_INTERVAL
+from .const import (
+    CONF_ADAPTIVE_SCAN_INTERVAL,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PORTS,
+    CONF_SLOW_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DOMAIN,
+    PLATFORMS,
+    SCAN_INTERVAL,
+    SLOW_SCAN_INTERVAL,
+    TIER_FAST,
+    TIER_SLOW,
+)
+from .coordinator import AdaptiveScanInterval, MercurySwitchDataUpdateCoordinator
 from .errors import CannotLoginError
-from .mercury_switch import HomeAssistantMercurySwitch
+from .mercury_switch import HomeAssistantMercurySwitch, get_snapshot_store
+from .services import async_setup_services
+from .snapshot import SwitchSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 type MercurySwitchConfigEntry = ConfigEntry[MercurySwitchData]
 
 
@@ -30,6 +55,21 @@ class MercurySwitchData:
 
     switch: HomeAssistantMercurySwitch
     coordinator_switch_infos: DataUpdateCoordinator
+    coordinator_port_infos: DataUpdateCoordinator | None = None
+    # options the entry was set up with
+    options: Mapping[str, Any] = field(default_factory=dict)
+
+    def coordinator_for(self, tier: str) -> DataUpdateCoordinator:
+        """Return the coordinator polling the given tier."""
+        if tier == TIER_FAST and self.coordinator_port_infos is not None:
+            return self.coordinator_port_infos
+        return self.coordinator_switch_infos
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the services of the Mercury Switch integration."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(
@@ -37,13 +77,18 @@ async def async_setup_entry(
 ) -> bool:
     """Set up Mercury Switch component."""
     switch = HomeAssistantMercurySwitch(hass, entry)
-    try:
-        if not await switch.async_setup():
-            raise ConfigEntryNotReady
-    except CannotLoginError as ex:
-        raise ConfigEntryNotReady from ex
-
-    entry.async_on_unload(entry.add_update_listener(update_listener))
+    # with a saved snapshot and device profile, the switch is set up and
+    # refreshed in the background while entities start from the snapshot
+    snapshot = None
+    if CONF_PORTS in entry.data:
+        snapshot = await switch.async_load_snapshot()
+    if snapshot is None:
+        try:
+            if not await switch.async_setup():
+                raise ConfigEntryNotReady
+        except (CannotLoginError, TimeoutError) as ex:
+            raise ConfigEntryNotReady from ex
+    entry.async_on_unload(switch.async_close)
 
     if not entry.unique_id:
         message = "entry.unique_id not defined."
@@ -58,34 +103,72 @@ async def async_setup_entry(
         configuration_url=f"http://{entry.data[CONF_HOST]}/",
     )
 
-    async def async_update_switch_infos() -> dict[str, Any] | None:
-        """Fetch data from the switch."""
-        return await switch.async_get_switch_infos()
+    fast_scan_interval = _scan_interval(entry, CONF_FAST_SCAN_INTERVAL, SCAN_INTERVAL)
+    adaptive_interval = None
+    if entry.options.get(CONF_ADAPTIVE_SCAN_INTERVAL, False):
+        adaptive_interval = AdaptiveScanInterval(
+            fast_scan_interval,
+            _scan_interval(entry, CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+            _scan_interval(entry, CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+        )
 
     # Create update coordinators
-    coordinator_switch_infos = DataUpdateCoordinator(
+    coordinator_switch_infos = MercurySwitchDataUpdateCoordinator(
         hass,
-        _LOGGER,
-        name=f"{switch.device_name} Switch infos",
-        update_method=async_update_switch_infos,
-        update_interval=SCAN_INTERVAL,
-        config_entry=entry,
+        switch,
+        TIER_SLOW,
+        _scan_interval(entry, CONF_SLOW_SCAN_INTERVAL, SLOW_SCAN_INTERVAL),
+    )
+    coordinator_port_infos = MercurySwitchDataUpdateCoordinator(
+        hass, switch, TIER_FAST, fast_scan_interval, adaptive_interval
     )
 
-    await coordinator_switch_infos.async_config_entry_first_refresh()
-
-    entry.runtime_data = MercurySwitchData(switch, coordinator_switch_infos)  # type: ignore[assignment]
+    if snapshot is None:
+        await coordinator_switch_infos.async_config_entry_first_refresh()
+        await coordinator_port_infos.async_config_entry_first_refresh()
+    else:
+        for coordinator in (coordinator_switch_infos, coordinator_port_infos):
+            coordinator.data = SwitchSnapshot.from_switch_infos(
+                snapshot[coordinator.tier]
+            )
+            entry.async_create_background_task(
+                hass,
+                coordinator.async_refresh(),
+                f"{coordinator.name} first refresh",
+            )
+
+    entry.runtime_data = MercurySwitchData(  # type: ignore[assignment]
+        switch, coordinator_switch_infos, coordinator_port_infos, dict(entry.options)
+    )
+    entry.async_on_unload(entry.add_update_listener(update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 
+def _scan_interval(entry: ConfigEntry, option: str, default: timedelta) -> timedelta:
+    """Return the scan interval configured in the entry options."""
+    if seconds := entry.options.get(option):
+        return timedelta(seconds=seconds)
+    return default
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
-async def update_listener(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved snapshot of a deleted config entry."""
+    await get_snapshot_store(hass, entry.entry_id).async_remove()
+
+
+async def update_listener(
+    hass: HomeAssistant, config_entry: MercurySwitchConfigEntry
+) -> None:
     """Handle options update."""
+    # updates of the cached device profile in the entry data need no reload
+    if config_entry.options == config_entry.runtime_data.options:
+        return
     await hass.config_entries.async_reload(config_entry.entry_id)
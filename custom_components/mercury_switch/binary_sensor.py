@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from collections import OrderedDict
+from functools import cache
 from typing import TYPE_CHECKING
 
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
@@ -30,6 +31,23 @@ PORT_TEMPLATE = OrderedDict(
 )
 
 
+@cache
+def port_binary_sensor_descriptions(
+    ports_cnt: int,
+) -> tuple[MercurySwitchBinarySensorEntityDescription, ...]:
+    """Return the binary sensor descriptions of all ports of a switch, built once."""
+    return tuple(
+        MercurySwitchBinarySensorEntityDescription(
+            key=port_sensor_key.format(port=port_nr),
+            name=port_sensor_data["name"].format(port=port_nr),
+            device_class=port_sensor_data["device_class"],
+            icon=port_sensor_data.get("icon"),
+        )
+        for port_nr in range(1, ports_cnt + 1)
+        for port_sensor_key, port_sensor_data in PORT_TEMPLATE.items()
+    )
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: MercurySwitchConfigEntry,
@@ -38,31 +56,24 @@ async def async_setup_entry(
     """Set up binary sensors for Mercury Switch component."""
     del hass
     switch = entry.runtime_data.switch
-    coordinator_switch_infos = entry.runtime_data.coordinator_switch_infos
 
     # Router entities
     switch_entities = []
 
-    ports_cnt = getattr(switch.api, "ports", 0) if switch.api is not None else 0
+    ports_cnt = switch.ports
     _LOGGER.info(
         "[binary_sensor.async_setup_entry] "
         "setting up Platform.BINARY_SENSOR for %d Switch Ports",
         ports_cnt,
     )
-    for i in range(ports_cnt):
-        port_nr = i + 1
-        for port_sensor_key, port_sensor_data in PORT_TEMPLATE.items():
-            description = MercurySwitchBinarySensorEntityDescription(
-                key=port_sensor_key.format(port=port_nr),
-                name=port_sensor_data["name"].format(port=port_nr),
-                device_class=port_sensor_data["device_class"],
-                icon=port_sensor_data.get("icon"),
-            )
-            port_status_binarysensor_entity = MercurySwitchRouterBinarySensorEntity(
-                coordinator=coordinator_switch_infos,
-                switch=switch,
-                entity_description=description,
-            )
-            switch_entities.append(port_status_binarysensor_entity)
+    # descriptions are shared by all switches with as many ports
+    switch_entities.extend(
+        MercurySwitchRouterBinarySensorEntity(
+            coordinator=entry.runtime_data.coordinator_for(description.tier),
+            switch=switch,
+            entity_description=description,
+        )
+        for description in port_binary_sensor_descriptions(ports_cnt)
+    )
 
     async_add_entities(switch_entities)
@@ -0,0 +1,78 @@
+"""Circuit breaker pausing the polls of an unreachable Mercury Switch."""
+
+from __future__ import annotations
+
+import time
+
+from .const import (
+    CIRCUIT_BREAKER_COOLDOWN,
+    CIRCUIT_BREAKER_THRESHOLD,
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+)
+
+
+class CircuitBreaker:
+    """
+    Stop polling a switch for a while after repeated failures.
+
+    Closed lets every poll through. After `threshold` consecutive failures it
+    opens and turns polls down for `cooldown` seconds, then lets one trial poll
+    through (half open), which closes it again on success or reopens it.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+        cooldown: float = CIRCUIT_BREAKER_COOLDOWN.total_seconds(),
+    ) -> None:
+        """Initialize a closed circuit breaker."""
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.trips = 0
+        # monotonic time the breaker opened at, None while closed
+        self.opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if self.opened_at is None:
+            return CIRCUIT_CLOSED
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return CIRCUIT_HALF_OPEN
+        return CIRCUIT_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next trial poll, 0 if polls may run."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return True if a poll may run, only one trial poll while half open."""
+        state = self.state
+        if state == CIRCUIT_CLOSED:
+            return True
+        if state == CIRCUIT_HALF_OPEN and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful poll."""
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def record_failure(self) -> None:
+        """Count a failed poll, open the breaker after too many in a row."""
+        self.failures += 1
+        if self._trial or (self.opened_at is None and self.failures >= self.threshold):
+            if not self._trial:
+                self.trips += 1
+            self.opened_at = time.monotonic()
+            self._trial = False
@@ -2,17 +2,52 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import callback
+from homeassistant.data_entry_flow import AbortFlow
 
-from .const import DOMAIN
-from .errors import CannotLoginError
-from .mercury_switch import get_api
+from .const import (
+    CONF_ADAPTIVE_SCAN_INTERVAL,
+    CONF_ASYNC_TRANSPORT,
+    CONF_COUNTER_STATISTICS,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MODEL,
+    CONF_PORTS,
+    CONF_PUBLISH_INTERVAL,
+    CONF_PUBLISH_THRESHOLD,
+    CONF_RATE_WINDOW,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_STATE_HEARTBEAT,
+    DEFAULT_CONF_TIMEOUT,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_RATE_WINDOW,
+    DEFAULT_STATE_HEARTBEAT,
+    DOMAIN,
+    PUBLISH_CLASSES,
+    PUBLISH_THRESHOLD_CLASSES,
+    RATE_HISTORY_SIZE,
+    SCAN_INTERVAL,
+    SETUP_REQUESTS,
+    SLOW_SCAN_INTERVAL,
+)
+from .errors import SWITCH_ERRORS, CannotLoginError
+from .mercury_switch import async_store_probe, get_session
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .session import MercurySwitchSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +65,27 @@ def _user_schema_with_defaults(user_input: dict[str, Any]) -> vol.Schema:
     )
 
 
+@callback
+def _async_close_late_session(
+    hass: HomeAssistant, login: asyncio.Future[tuple[MercurySwitchSession, str]]
+) -> None:
+    """Close the session of a login which finished after the flow gave up on it."""
+    if not login.cancelled() and login.exception() is None:
+        session, _unique_id = login.result()
+        hass.async_add_executor_job(session.close)
+
+
+def _login(host: str, username: str, password: str) -> tuple[MercurySwitchSession, str]:
+    """Login to the switch and return the session and the switch's unique id."""
+    session = get_session(host, username, password)
+    try:
+        # detects the model again if that failed while logging in
+        return session, session.api.get_unique_id()
+    except Exception:
+        session.close()
+        raise
+
+
 class OptionsFlowHandler(config_entries.OptionsFlow):
     """Options for the component."""
 
@@ -40,7 +96,73 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
-        return self.async_show_form(step_id="init", data_schema=vol.Schema({}))
+        options = self.config_entry.options
+        fields: dict[vol.Optional, Any] = {
+            vol.Optional(
+                CONF_FAST_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_FAST_SCAN_INTERVAL, int(SCAN_INTERVAL.total_seconds())
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+            vol.Optional(
+                CONF_SLOW_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_SLOW_SCAN_INTERVAL, int(SLOW_SCAN_INTERVAL.total_seconds())
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+            vol.Optional(
+                CONF_ADAPTIVE_SCAN_INTERVAL,
+                default=options.get(CONF_ADAPTIVE_SCAN_INTERVAL, False),
+            ): bool,
+            vol.Optional(
+                CONF_MIN_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_MIN_SCAN_INTERVAL,
+                    int(DEFAULT_MIN_SCAN_INTERVAL.total_seconds()),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+            vol.Optional(
+                CONF_MAX_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_MAX_SCAN_INTERVAL,
+                    int(DEFAULT_MAX_SCAN_INTERVAL.total_seconds()),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+            vol.Optional(
+                CONF_ASYNC_TRANSPORT,
+                default=options.get(CONF_ASYNC_TRANSPORT, False),
+            ): bool,
+            vol.Optional(
+                CONF_REQUEST_TIMEOUT,
+                default=options.get(
+                    CONF_REQUEST_TIMEOUT, int(DEFAULT_CONF_TIMEOUT.total_seconds())
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+            vol.Optional(
+                CONF_STATE_HEARTBEAT,
+                default=options.get(CONF_STATE_HEARTBEAT, DEFAULT_STATE_HEARTBEAT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_RATE_WINDOW,
+                default=options.get(CONF_RATE_WINDOW, DEFAULT_RATE_WINDOW),
+            ): vol.All(vol.Coerce(int), vol.Range(min=2, max=RATE_HISTORY_SIZE)),
+            vol.Optional(
+                CONF_COUNTER_STATISTICS,
+                default=options.get(CONF_COUNTER_STATISTICS, False),
+            ): bool,
+        }
+        for publish_class in PUBLISH_CLASSES:
+            interval = CONF_PUBLISH_INTERVAL.format(publish_class=publish_class)
+            fields[vol.Optional(interval, default=options.get(interval, 0))] = vol.All(
+                vol.Coerce(int), vol.Range(min=0)
+            )
+            if publish_class not in PUBLISH_THRESHOLD_CLASSES:
+                continue
+            threshold = CONF_PUBLISH_THRESHOLD.format(publish_class=publish_class)
+            fields[vol.Optional(threshold, default=options.get(threshold, 0))] = (
+                vol.All(vol.Coerce(float), vol.Range(min=0))
+            )
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(fields))
 
 
 class MercurySwitchFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -94,19 +216,30 @@ class MercurySwitchFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         password = user_input[CONF_PASSWORD]
 
         # Open connection and check authentication
+        login = self.hass.async_add_executor_job(_login, host, username, password)
         try:
-            api = await self.hass.async_add_executor_job(
-                get_api, host, username, password
-            )
+            async with asyncio.timeout(
+                DEFAULT_CONF_TIMEOUT.total_seconds() * SETUP_REQUESTS
+            ):
+                # the login thread cannot be stopped, it finishes on its own
+                session, unique_id = await asyncio.shield(login)
         except CannotLoginError:
             errors["base"] = "invalid_auth"
-        except (ConnectionError, TimeoutError, OSError):
+        except SWITCH_ERRORS as ex:
+            _LOGGER.warning("Error connecting to %s: %s", host, ex)
+            errors["base"] = "cannot_connect"
+        except TimeoutError:
+            _LOGGER.warning("Timed out connecting to %s", host)
+            errors["base"] = "cannot_connect"
+            login.add_done_callback(partial(_async_close_late_session, self.hass))
+        except (ConnectionError, OSError):
             _LOGGER.exception("Error connecting to switch")
             errors["base"] = "cannot_connect"
 
         if errors:
             return await self._show_setup_form(user_input, errors)
 
+        api = session.api
         config_data = {
             CONF_HOST: host,
             CONF_USERNAME: username,
@@ -114,13 +247,22 @@ class MercurySwitchFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         }
 
         # Check if already configured
-        unique_id = await self.hass.async_add_executor_job(api.get_unique_id)
-        await self.async_set_unique_id(unique_id, raise_on_progress=False)
-        self._abort_if_unique_id_configured(updates=config_data)
+        try:
+            await self.async_set_unique_id(unique_id, raise_on_progress=False)
+            self._abort_if_unique_id_configured(updates=config_data)
+        except AbortFlow:
+            await self.hass.async_add_executor_job(session.close)
+            raise
 
         # set autodetected switch model name
         model_name = api.switch_model.MODEL_NAME
         name = f"{model_name} ({host})"
+        if model_name:
+            config_data[CONF_MODEL] = model_name
+            config_data[CONF_PORTS] = api.ports
+
+        # the entry setup reuses the session instead of logging in again
+        async_store_probe(self.hass, session, username, password)
 
         return self.async_create_entry(
             title=name,
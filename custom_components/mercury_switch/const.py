@@ -6,12 +6,99 @@ from homeassistant.const import Platform
 
 DOMAIN = "mercury_switch"
 
-PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
+PLATFORMS = [Platform.BINARY_SENSOR, Platform.EVENT, Platform.SENSOR]
 
 DEFAULT_NAME = "Mercury Switch"
 SCAN_INTERVAL = timedelta(seconds=30)
+SLOW_SCAN_INTERVAL = timedelta(hours=1)
 DEFAULT_CONF_TIMEOUT = timedelta(seconds=15)
+# consecutive failed polls opening the circuit breaker of a switch, and how
+# long polls are then turned down before a trial poll
+CIRCUIT_BREAKER_THRESHOLD = 5
+CIRCUIT_BREAKER_COOLDOWN = timedelta(minutes=5)
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
 KEY_COORDINATOR_SWITCH_INFOS = "coordinator_switch_infos"
 KEY_SWITCH = "switch"
+KEY_SCHEDULER = "scheduler"
+KEY_PROBES = "probes"
+# last switch infos of each entry, persisted for a fast startup
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 300
+# how long a session validated by the config flow is kept for the entry setup
+PROBE_TTL = timedelta(minutes=2)
+# switches polled at the same time across all config entries
+MAX_CONCURRENT_SWITCH_POLLS = 4
+# callers overlapping a fetch of the same pages started this recently share it
+FETCH_COALESCE_WINDOW = timedelta(seconds=5)
+# device profile cached in the entry data after the first successful setup
+CONF_MODEL = "model"
+CONF_PORTS = "ports"
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+CONF_SLOW_SCAN_INTERVAL = "slow_scan_interval"
+CONF_ADAPTIVE_SCAN_INTERVAL = "adaptive_scan_interval"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+DEFAULT_MIN_SCAN_INTERVAL = timedelta(seconds=10)
+DEFAULT_MAX_SCAN_INTERVAL = timedelta(minutes=5)
+CONF_ASYNC_TRANSPORT = "async_transport"
+# seconds each login, model detection and page fetch may take
+CONF_REQUEST_TIMEOUT = "request_timeout"
+# requests of setting up a session, model detection and login
+SETUP_REQUESTS = 2
+# requests of fetching a page after a session expired, the page, a re-login
+# and the retry, each bounded by the request timeout on its own
+PAGE_REQUESTS = 3
+CONF_STATE_HEARTBEAT = "state_heartbeat"
+DEFAULT_STATE_HEARTBEAT = 0
+CONF_RATE_WINDOW = "rate_window"
+DEFAULT_RATE_WINDOW = 2
+RATE_HISTORY_SIZE = 10
+# port packet counters imported as hourly statistics instead of sensor states
+CONF_COUNTER_STATISTICS = "counter_statistics"
+# port sensors whose states are published at most every interval seconds
+# and/or on a relative change of threshold percent, configured per class
+PUBLISH_COUNTERS = "counters"
+PUBLISH_RATES = "rates"
+PUBLISH_LINK_SPEED = "link_speed"
+PUBLISH_CLASSES = (PUBLISH_COUNTERS, PUBLISH_RATES, PUBLISH_LINK_SPEED)
+# classes with numeric values, which a relative change threshold applies to
+PUBLISH_THRESHOLD_CLASSES = (PUBLISH_COUNTERS, PUBLISH_RATES)
+CONF_PUBLISH_INTERVAL = "{publish_class}_publish_interval"
+CONF_PUBLISH_THRESHOLD = "{publish_class}_publish_threshold"
+# fired once per port for the link transitions of a debounce window
+EVENT_PORT = f"{DOMAIN}_port_event"
+PORT_EVENT_COOLDOWN = timedelta(seconds=10)
+PORT_EVENT_LINK_UP = "link_up"
+PORT_EVENT_LINK_DOWN = "link_down"
+PORT_EVENT_FLAP = "flap"
+PORT_EVENT_TYPES = [PORT_EVENT_LINK_UP, PORT_EVENT_LINK_DOWN, PORT_EVENT_FLAP]
+# polls kept in the rolling latency histogram of each switch
+POLL_STATS_SIZE = 100
+
+SERVICE_PROFILE = "profile"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CYCLES = "cycles"
+ATTR_TOP = "top"
+DEFAULT_PROFILE_CYCLES = 5
+DEFAULT_PROFILE_TOP = 10
+
+# polling tiers, port link state and counters are fetched more often than
+# system info and VLAN tables
+TIER_FAST = "fast"
+TIER_SLOW = "slow"
+
+PAGE_SYSTEM_INFO = "system_info"
+PAGE_PORT_SETTING = "port_setting"
+PAGE_PORT_STATISTICS = "port_statistics"
+PAGE_VLAN = "vlan"
+TIER_PAGES = {
+    TIER_FAST: (PAGE_PORT_SETTING, PAGE_PORT_STATISTICS),
+    TIER_SLOW: (PAGE_SYSTEM_INFO, PAGE_VLAN),
+}
+# pages of one switch fetched at the same time
+PAGE_FETCH_CONCURRENCY = 2
+
 ON_VALUES = ["on", True]
 OFF_VALUES = ["off", False]
@@ -0,0 +1,233 @@
+"""Update coordinators for Mercury Switch."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import TIER_FAST
+from .errors import SWITCH_ERRORS, CannotLoginError, SwitchUnreachableError
+from .scheduler import get_scheduler
+from .snapshot import SwitchSnapshot
+
+if TYPE_CHECKING:
+    from datetime import timedelta
+
+    from homeassistant.core import HomeAssistant
+
+    from .mercury_switch import HomeAssistantMercurySwitch
+    from .snapshot import SnapshotChange
+
+_LOGGER = logging.getLogger(__name__)
+
+# interval is multiplied by this after an unchanged or failed poll
+BACKOFF_FACTOR = 2
+# number of polls at the minimum interval after a link change or traffic burst
+BOOST_POLLS = 3
+# total packet rate must exceed the average by this factor to count as burst
+BURST_FACTOR = 4
+BURST_MIN_RATE = 100.0
+# total packets per second of an idle switch, e.g. broadcasts, ARP and LLDP
+IDLE_MAX_RATE = 20.0
+# weight of the latest total packet rate in the moving average
+TRAFFIC_AVERAGE_WEIGHT = 0.2
+# seconds a poll may start late before it is logged, the timer is not exact
+MAX_POLL_LAG = 1.0
+
+
+class AdaptiveScanInterval:
+    """Pick the next scan interval from what the last poll observed."""
+
+    def __init__(self, base: timedelta, minimum: timedelta, maximum: timedelta) -> None:
+        """Initialize the adaptive interval within [minimum, maximum]."""
+        self.minimum = min(minimum, base)
+        self.maximum = max(maximum, base)
+        self.base = base
+        self.current = base
+        self._boost_polls = 0
+        self._traffic_average: float | None = None
+
+    def after_failure(self) -> timedelta:
+        """Return the interval after the switch could not be reached."""
+        self._boost_polls = 0
+        self.current = min(max(self.current, self.base) * BACKOFF_FACTOR, self.maximum)
+        return self.current
+
+    def after_update(self, change: SnapshotChange, data: SwitchSnapshot) -> timedelta:
+        """Return the interval after a successful poll."""
+        if self._traffic_burst(data) or change.link_changed:
+            self._boost_polls = BOOST_POLLS
+        if self._boost_polls:
+            self._boost_polls -= 1
+            self.current = self.minimum
+        elif change.state_changed or data.ports.total_rate() >= IDLE_MAX_RATE:
+            self.current = self.base
+        else:
+            # idle: only background traffic moved the counters
+            self.current = min(
+                max(self.current, self.base) * BACKOFF_FACTOR, self.maximum
+            )
+        return self.current
+
+    def _traffic_burst(self, data: SwitchSnapshot) -> bool:
+        """Return True if the total packet rate jumped above its average."""
+        total_rate = data.ports.total_rate()
+        average = self._traffic_average
+        if average is None:
+            self._traffic_average = total_rate
+            return False
+        self._traffic_average = (
+            TRAFFIC_AVERAGE_WEIGHT * total_rate + (1 - TRAFFIC_AVERAGE_WEIGHT) * average
+        )
+        return total_rate >= BURST_MIN_RATE and total_rate > BURST_FACTOR * average
+
+
+class MercurySwitchDataUpdateCoordinator(DataUpdateCoordinator[SwitchSnapshot | None]):
+    """
+    Coordinator polling one tier of Mercury switch pages.
+
+    Listeners added with a switch infos key as context are only called when
+    the value of that key changed, listeners without context on every update.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        switch: HomeAssistantMercurySwitch,
+        tier: str,
+        update_interval: timedelta,
+        adaptive_interval: AdaptiveScanInterval | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        infos = "Port infos" if tier == TIER_FAST else "Switch infos"
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{switch.device_name} {infos}",
+            update_interval=update_interval,
+            config_entry=switch.entry,
+        )
+        self.switch = switch
+        self.tier = tier
+        self.adaptive_interval = adaptive_interval
+        self.scheduler = get_scheduler(hass)
+        self._interval = update_interval
+        # added once to the interval after the first poll to stagger switches
+        self._poll_offset: timedelta | None = self.scheduler.register(
+            tier, switch.entry.entry_id, update_interval
+        )
+        # loop time the next scheduled poll is due at
+        self._poll_due: float | None = None
+        # listeners by switch infos key, None for those of every update
+        self._context_listeners: dict[str | None, dict[object, CALLBACK_TYPE]] = {}
+        self._keyed_listeners = 0
+        # keys changed by the last update, None to call all listeners
+        self._changed_keys: set[str] | None = None
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> CALLBACK_TYPE:
+        """Listen for data updates, of a single switch infos key if given."""
+        remove = super().async_add_listener(update_callback, context)
+        key = context if isinstance(context, str) else None
+        listeners = self._context_listeners.setdefault(key, {})
+        token = object()
+        listeners[token] = update_callback
+        self._keyed_listeners += key is not None
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            if listeners.pop(token, None) is not None:
+                self._keyed_listeners -= key is not None
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of every update and of the changed keys."""
+        changed_keys, self._changed_keys = self._changed_keys, None
+        if changed_keys is None:
+            super().async_update_listeners()
+            return
+        update_callbacks = list(self._context_listeners.get(None, {}).values())
+        keyed_callbacks = [
+            update_callback
+            for key in changed_keys
+            for update_callback in self._context_listeners.get(key, {}).values()
+        ]
+        # unchanged entities are not even asked whether to write their state
+        skipped = self._keyed_listeners - len(keyed_callbacks)
+        self.switch.skipped_state_writes += skipped
+        for update_callback in update_callbacks + keyed_callbacks:
+            update_callback()
+
+    async def async_shutdown(self) -> None:
+        """Release the scheduler slot and cancel scheduled polls."""
+        self.scheduler.unregister(self.tier, self.switch.entry.entry_id)
+        await super().async_shutdown()
+
+    async def _async_update_data(self) -> SwitchSnapshot | None:
+        """Fetch the tier's pages from the switch and parse them into a snapshot."""
+        self._changed_keys = None
+        try:
+            switch_infos = await self._async_fetch()
+        except Exception as ex:
+            if self.adaptive_interval is not None:
+                self._interval = self.adaptive_interval.after_failure()
+            self._schedule_next_poll()
+            if isinstance(ex, CannotLoginError):
+                message = f"Could not login to {self.switch.device_name}"
+                raise UpdateFailed(message) from ex
+            if isinstance(ex, SwitchUnreachableError):
+                raise UpdateFailed(str(ex)) from ex
+            if isinstance(ex, SWITCH_ERRORS):
+                message = f"{self.switch.device_name}: {ex}"
+                raise UpdateFailed(message) from ex
+            raise
+        if switch_infos is None:
+            self._schedule_next_poll()
+            return None
+        self.switch.async_save_snapshot(self.tier, switch_infos)
+        # the snapshot is updated in place, its port arrays are reused every poll
+        data = self.data or SwitchSnapshot()
+        change = data.update(switch_infos)
+        if change.link_transitions:
+            self.switch.port_events.async_add_transitions(change, data.ports)
+        # all entities are updated after a failed poll, their availability changes
+        if (
+            self.data is not None
+            and self.last_update_success
+            and self.switch.state_heartbeat is None
+        ):
+            self._changed_keys = change.keys
+        if self.adaptive_interval is not None:
+            interval = self.adaptive_interval.after_update(change, data)
+            if interval != self._interval:
+                _LOGGER.debug("%s: scan interval is now %s", self.name, interval)
+            self._interval = interval
+        self._schedule_next_poll()
+        return data
+
+    async def _async_fetch(self) -> dict[str, Any] | None:
+        """Fetch the tier's pages, within the fleet-wide poll limit."""
+        async with self.scheduler.semaphore:
+            if self._poll_due is not None:
+                lag = max(self.hass.loop.time() - self._poll_due, 0.0)
+                if lag > MAX_POLL_LAG:
+                    _LOGGER.debug("%s: poll started %.1fs late", self.name, lag)
+                self.switch.poll_lag = lag
+            return await self.switch.async_get_switch_infos(self.tier)
+
+    def _schedule_next_poll(self) -> None:
+        """Set the interval to the next poll, offset once to stagger switches."""
+        interval = self._interval
+        if self._poll_offset is not None:
+            interval += self._poll_offset
+            self._poll_offset = None
+        self.update_interval = interval
+        self._poll_due = self.hass.loop.time() + interval.total_seconds()
@@ -0,0 +1,171 @@
+"""Long-term statistics imported from Mercury Switch port counters."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# counter key suffix -> statistic name suffix
+STATISTIC_COUNTERS = {
+    "tx_good": "TX Packets",
+    "rx_good": "RX Packets",
+}
+STATISTIC_UNIT = "packets"
+
+
+@dataclass
+class CounterSeries:
+    """Hourly sums of one port counter, kept until imported."""
+
+    metadata: StatisticMetaData
+    # counter value of the first and of the latest poll
+    first_value: int | None = None
+    last_value: int | None = None
+    # increase of the counter since the first poll
+    increase: int = 0
+    # start of the hour the latest poll fell into
+    hour: datetime | None = None
+    # completed hours as (start, counter value, increase at the end of the hour)
+    hours: list[tuple[datetime, int, int]] = field(default_factory=list)
+    # sum before the first poll, read from the recorder on the first import
+    base_sum: float | None = None
+
+    def add(self, value: int, hour: datetime) -> None:
+        """Add the counter value of a poll made during `hour`."""
+        if self.hour is not None and hour != self.hour and self.last_value is not None:
+            self.hours.append((self.hour, self.last_value, self.increase))
+        if self.last_value is None:
+            self.first_value = value
+        elif value >= self.last_value:
+            self.increase += value - self.last_value
+        else:
+            # counters went backwards, the switch rebooted or was reset
+            self.increase += value
+        self.last_value = value
+        self.hour = hour
+
+
+class CounterStatistics:
+    """
+    Import hourly sums of the port packet counters as external statistics.
+
+    Replaces the state rows of the counter sensors, the recorder only gets one
+    row per counter and hour, imported when the hour is over.
+    """
+
+    def __init__(self, hass: HomeAssistant, unique_id: str, device_name: str) -> None:
+        """Initialize the statistics of a switch."""
+        self.hass = hass
+        self._prefix = f"{DOMAIN}:{slugify(unique_id)}"
+        self._device_name = device_name
+        self._series: dict[tuple[int, str], CounterSeries] = {}
+        self._import_lock = asyncio.Lock()
+
+    def statistic_id(self, port: int, counter: str) -> str:
+        """Return the statistic id of a port counter."""
+        return f"{self._prefix}_port_{port}_{counter}"
+
+    def update(self, switch_infos: dict[str, Any], ports: int, now: datetime) -> bool:
+        """Add the counters of a poll, return True if an hour is ready to import."""
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        pending = False
+        for port in range(1, ports + 1):
+            for counter in STATISTIC_COUNTERS:
+                value = switch_infos.get(f"port_{port}_{counter}")
+                if not isinstance(value, int):
+                    continue
+                series = self._series.get((port, counter))
+                if series is None:
+                    series = self._series[(port, counter)] = self._new_series(
+                        port, counter
+                    )
+                series.add(value, hour)
+                pending |= bool(series.hours)
+        return pending
+
+    def _new_series(self, port: int, counter: str) -> CounterSeries:
+        """Return the series of a port counter."""
+        return CounterSeries(
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{self._device_name} Port {port} {STATISTIC_COUNTERS[counter]}",
+                source=DOMAIN,
+                statistic_id=self.statistic_id(port, counter),
+                unit_of_measurement=STATISTIC_UNIT,
+            )
+        )
+
+    async def async_import(self, *, flush: bool = False) -> None:
+        """Import the completed hours, and the current one if `flush` is set."""
+        # once the recorder stopped, the increase is counted after the restart
+        if not get_instance(self.hass).recording:
+            return
+        async with self._import_lock:
+            for series in self._series.values():
+                hours = list(series.hours)
+                completed = len(hours)
+                if flush and series.hour is not None and series.last_value is not None:
+                    hours.append((series.hour, series.last_value, series.increase))
+                if not hours:
+                    continue
+                if series.base_sum is None:
+                    series.base_sum = await self._async_base_sum(series)
+                async_add_external_statistics(
+                    self.hass,
+                    series.metadata,
+                    [
+                        StatisticData(
+                            start=start, state=value, sum=series.base_sum + increase
+                        )
+                        for start, value, increase in hours
+                    ],
+                )
+                # polls may have completed more hours while the base sum was read
+                del series.hours[:completed]
+
+    async def _async_base_sum(self, series: CounterSeries) -> float:
+        """Return the imported sum the increase since the first poll adds to."""
+        statistic_id = series.metadata["statistic_id"]
+        last_statistics = await get_instance(self.hass).async_add_executor_job(
+            partial(
+                get_last_statistics,
+                self.hass,
+                1,
+                statistic_id,
+                convert_units=True,
+                types={"state", "sum"},
+            )
+        )
+        if not (rows := last_statistics.get(statistic_id)):
+            return 0.0
+        last_sum = rows[0].get("sum") or 0.0
+        last_state = rows[0].get("state")
+        first_value = series.first_value or 0
+        if last_state is None:
+            return last_sum
+        # count what the counter grew while nothing was polled, e.g. a restart
+        if first_value < last_state:
+            _LOGGER.debug("%s was reset since its last import", statistic_id)
+            return last_sum + first_value
+        return last_sum + first_value - last_state
@@ -1,7 +1,21 @@
 """Errors for the Mercury Switch integration."""
 
 from homeassistant.exceptions import HomeAssistantError
+from py_mercury_switch_api.exceptions import MercurySwitchError
+from py_mercury_switch_api.models import MercurySwitchModelNotDetectedError
+from py_mercury_switch_api.parsers import MercurySwitchPageParserError
+
+# errors of an unreachable or misbehaving switch, expected rather than bugs
+SWITCH_ERRORS = (
+    MercurySwitchError,
+    MercurySwitchModelNotDetectedError,
+    MercurySwitchPageParserError,
+)
 
 
 class CannotLoginError(HomeAssistantError):
     """Unable to login to the switch."""
+
+
+class SwitchUnreachableError(HomeAssistantError):
+    """Polls of the switch are paused by its circuit breaker."""
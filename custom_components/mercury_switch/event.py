@@ -0,0 +1,22 @@
+"""Events for Mercury Switch."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+    from . import MercurySwitchConfigEntry
+from .mercury_entities import MercurySwitchPortEventEntity
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: MercurySwitchConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the port events entity for Mercury Switch component."""
+    del hass
+    async_add_entities([MercurySwitchPortEventEntity(entry.runtime_data.switch)])
@@ -5,25 +5,31 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal
+from typing import Any
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
+from homeassistant.components.event import EventEntity
 from homeassistant.components.sensor import (
     RestoreSensor,
+    SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .const import DOMAIN, PORT_EVENT_TYPES, TIER_FAST
 from .mercury_switch import (
     HomeAssistantMercurySwitch,
     MercurySwitchAPICoordinatorEntity,
 )
+from .snapshot import value_getter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +40,17 @@ class MercurySwitchSensorEntityDescription(SensorEntityDescription):
 
     value: Callable = lambda data: data
     index: int = 0
+    tier: str = TIER_FAST
+    # class of the publish policy downsampling the states, if any
+    publish_class: str | None = None
+
+
+@dataclass(frozen=True)
+class MercurySwitchStatsSensorEntityDescription(SensorEntityDescription):
+    """Describes Mercury Switch integration statistics sensor entities."""
+
+    value: Callable[[HomeAssistantMercurySwitch], StateType] = lambda _switch: None
+    tier: str = TIER_FAST
 
 
 @dataclass(frozen=True)
@@ -42,6 +59,7 @@ class MercurySwitchBinarySensorEntityDescription(BinarySensorEntityDescription):
 
     value: Callable = lambda data: data
     index: int = 0
+    tier: str = TIER_FAST
 
     device_class: BinarySensorDeviceClass | str | None = None
     last_reset: datetime | None = None
@@ -66,13 +84,18 @@ class MercurySwitchRouterSensorEntity(MercurySwitchAPICoordinatorEntity, Restore
         entity_description: MercurySwitchSensorEntityDescription,
     ) -> None:
         """Initialize a Mercury device."""
-        super().__init__(coordinator, switch)
+        # only updated when the value of its switch infos key changed
+        super().__init__(coordinator, switch, entity_description.key)
         self.entity_description = entity_description
         self._name = f"{switch.device_name} {entity_description.name}"
         self._unique_id = (
             f"{switch.unique_id}-{entity_description.key}-{entity_description.index}"
         )
         self._value: StateType | date | datetime | Decimal = None
+        self._get_value = value_getter(entity_description.key)
+        self._publish_policy = switch.publish_policies.get(
+            entity_description.publish_class
+        )
         self.async_update_device()
 
     def __repr__(self) -> str:
@@ -108,7 +131,7 @@ class MercurySwitchRouterSensorEntity(MercurySwitchAPICoordinatorEntity, Restore
         if self.coordinator.data is None:
             return
 
-        data = self.coordinator.data.get(self.entity_description.key)
+        data = self._get_value(self.coordinator.data)
         if data is None:
             self._value = None
             _LOGGER.debug(
@@ -121,6 +144,44 @@ class MercurySwitchRouterSensorEntity(MercurySwitchAPICoordinatorEntity, Restore
         self._value = self.entity_description.value(data)
 
 
+class MercurySwitchStatsSensorEntity(MercurySwitchAPICoordinatorEntity, SensorEntity):
+    """Representation of a statistic the integration keeps about a switch."""
+
+    entity_description: MercurySwitchStatsSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        switch: HomeAssistantMercurySwitch,
+        entity_description: MercurySwitchStatsSensorEntityDescription,
+    ) -> None:
+        """Initialize a Mercury device."""
+        super().__init__(coordinator, switch)
+        self.entity_description = entity_description
+        self._name = f"{switch.device_name} {entity_description.name}"
+        self._unique_id = f"{switch.unique_id}-{entity_description.key}"
+        self.async_update_device()
+
+    def __repr__(self) -> str:
+        """Return human readable object representation."""
+        return f"<MercurySwitchStatsSensorEntity unique_id={self._unique_id}>"
+
+    @property
+    def available(self) -> bool:
+        """Return True, statistics are kept even if the switch is unreachable."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self._value
+
+    @callback
+    def async_update_device(self) -> None:
+        """Update the Mercury device."""
+        self._value = self.entity_description.value(self._switch)
+
+
 class MercurySwitchRouterBinarySensorEntity(
     MercurySwitchAPICoordinatorEntity, BinarySensorEntity
 ):
@@ -136,13 +197,15 @@ class MercurySwitchRouterBinarySensorEntity(
         entity_description: MercurySwitchBinarySensorEntityDescription,
     ) -> None:
         """Initialize a Mercury device."""
-        super().__init__(coordinator, switch)
+        # only updated when the value of its switch infos key changed
+        super().__init__(coordinator, switch, entity_description.key)
         self.entity_description = entity_description
         self._name = f"{switch.device_name} {entity_description.name}"
         self._unique_id = (
             f"{switch.unique_id}-{entity_description.key}-{entity_description.index}"
         )
         self._value = False
+        self._get_value = value_getter(entity_description.key)
         self.async_update_device()
 
     def __repr__(self) -> str:
@@ -170,7 +233,7 @@ class MercurySwitchRouterBinarySensorEntity(
         if self.coordinator.data is None:
             return
 
-        data = self.coordinator.data.get(self.entity_description.key)
+        data = self._get_value(self.coordinator.data)
         if data is None:
             self._value = False
             _LOGGER.debug(
@@ -180,12 +243,36 @@ class MercurySwitchRouterBinarySensorEntity(
             )
             return
 
-        # Convert to boolean
-        if isinstance(data, str):
-            self._value = data.lower() in ["on", "true", "1", "yes"]
-        elif isinstance(data, bool):
-            self._value = data
-        elif isinstance(data, (int, float)):
-            self._value = bool(data)
-        else:
-            self._value = bool(data)
+        # on/off values are normalized to bool by the snapshot
+        self._value = data
+
+
+class MercurySwitchPortEventEntity(EventEntity):
+    """Link transition events of all ports of a Mercury switch."""
+
+    _attr_event_types = PORT_EVENT_TYPES
+    _attr_icon = "mdi:ethernet"
+
+    def __init__(self, switch: HomeAssistantMercurySwitch) -> None:
+        """Initialize the port events of a switch."""
+        self._switch = switch
+        self._attr_name = f"{switch.device_name} Port Events"
+        self._attr_unique_id = f"{switch.unique_id}-port_events-0"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, switch.unique_id)})
+
+    def __repr__(self) -> str:
+        """Return human readable object representation."""
+        return f"<MercurySwitchPortEventEntity unique_id={self._attr_unique_id}>"
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the port events of the switch."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._switch.port_events.async_add_listener(self._async_handle_event)
+        )
+
+    @callback
+    def _async_handle_event(self, event_type: str, data: dict[str, Any]) -> None:
+        """Trigger the entity on a port event."""
+        self._trigger_event(event_type, data)
+        self.async_write_ha_state()
@@ -4,43 +4,249 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from abc import abstractmethod
+from dataclasses import dataclass, field
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from datetime import datetime
+
     from homeassistant.config_entries import ConfigEntry
+    from py_mercury_switch_api.fetcher import BaseResponse
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
 )
-from py_mercury_switch_api import MercurySwitchConnector
+from homeassistant.util import dt as dt_util
+from py_mercury_switch_api import (
+    MercurySwitchConnector,
+    MercurySwitchModelNotDetectedError,
+    PageNotLoadedError,
+)
 from py_mercury_switch_api import __version__ as api_version
+from py_mercury_switch_api.models import MODELS, AutodetectedMercuryModel
+from py_mercury_switch_api.parsers import (
+    MercurySwitchPageParserError,
+    PageParser,
+    create_page_parser,
+)
 
-from .const import DOMAIN
-from .errors import CannotLoginError
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    CONF_ASYNC_TRANSPORT,
+    CONF_COUNTER_STATISTICS,
+    CONF_MODEL,
+    CONF_PORTS,
+    CONF_RATE_WINDOW,
+    CONF_REQUEST_TIMEOUT,
+    CONF_STATE_HEARTBEAT,
+    DEFAULT_RATE_WINDOW,
+    DEFAULT_STATE_HEARTBEAT,
+    DOMAIN,
+    FETCH_COALESCE_WINDOW,
+    KEY_PROBES,
+    PAGE_FETCH_CONCURRENCY,
+    PAGE_PORT_SETTING,
+    PAGE_PORT_STATISTICS,
+    PAGE_REQUESTS,
+    PAGE_SYSTEM_INFO,
+    PAGE_VLAN,
+    PROBE_TTL,
+    SETUP_REQUESTS,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+    TIER_PAGES,
+)
+from .counter_statistics import CounterStatistics
+from .errors import SWITCH_ERRORS, SwitchUnreachableError
+from .poll_stats import PollStats
+from .port_events import PortEvents
+from .port_rates import PortRateTracker
+from .publish_policy import PublishPolicy, publish_policies
+from .session import (
+    DEFAULT_REQUEST_TIMEOUT,
+    AsyncMercurySwitchSession,
+    MercurySwitchSession,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# page -> (switch model templates attribute, parser method, parser needs ports)
+SWITCH_PAGES: dict[str, tuple[str, str, bool]] = {
+    PAGE_SYSTEM_INFO: ("SYSTEM_INFO_TEMPLATES", "parse_system_info", False),
+    PAGE_PORT_SETTING: ("PORT_SETTING_TEMPLATES", "parse_port_setting", True),
+    PAGE_PORT_STATISTICS: (
+        "PORT_STATISTICS_TEMPLATES",
+        "parse_port_statistics",
+        True,
+    ),
+    PAGE_VLAN: ("VLAN_8021Q_TEMPLATES", "parse_vlan_info", False),
+}
+
+# VLAN page might not be available, same defaults as get_switch_infos()
+VLAN_DEFAULTS: dict[str, Any] = {
+    "vlan_enabled": False,
+    "vlan_type": "None",
+    "vlan_count": 0,
+}
+
+
+def get_cached_model(data: Mapping[str, Any]) -> type[AutodetectedMercuryModel] | None:
+    """Return the switch model cached in a config entry's data, if any."""
+    model_name = data.get(CONF_MODEL)
+    if not model_name:
+        return None
+    for model in MODELS:
+        if model_name == model.MODEL_NAME:
+            return model
+    return None
+
+
+def apply_model(
+    api: MercurySwitchConnector,
+    model: type[AutodetectedMercuryModel],
+    ports: int | None = None,
+) -> None:
+    """Use a known switch model instead of autodetecting it."""
+    api.switch_model = model
+    api.ports = ports or model.PORTS
+
 
-def get_api(host: str, username: str, password: str) -> MercurySwitchConnector:
-    """Get the Mercury Switch API and login to it."""
+def get_session(
+    host: str,
+    username: str,
+    password: str,
+    profile: Mapping[str, Any] | None = None,
+    timeout: float = DEFAULT_REQUEST_TIMEOUT,
+) -> MercurySwitchSession:
+    """Get the Mercury Switch API, login to it and return the session."""
     api: MercurySwitchConnector = MercurySwitchConnector(host, username, password)
-    try:
-        api.autodetect_model()
-    except Exception:  # noqa: BLE001
-        _LOGGER.warning("Could not autodetect model", exc_info=True)
+    session = MercurySwitchSession(api, timeout)
+    model = get_cached_model(profile or {})
+    if model is not None:
+        apply_model(api, model, (profile or {}).get(CONF_PORTS))
+    else:
+        try:
+            api.autodetect_model()
+        except Exception:  # noqa: BLE001
+            _LOGGER.warning("Could not autodetect model", exc_info=True)
     _LOGGER.info(
         "Created MercurySwitchConnector API version %s for model %s.",
         str(api_version),
         str(api.switch_model.MODEL_NAME),
     )
     # Login to verify credentials
-    if not api.get_login_cookie():
-        raise CannotLoginError
-    return api
+    session.login()
+    return session
+
+
+@dataclass
+class SwitchProbe:
+    """Logged in session of a switch validated by the config flow."""
+
+    session: MercurySwitchSession
+    username: str
+    password: str
+    probed_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def expired(self) -> bool:
+        """Return True if the probe is too old to be reused."""
+        return time.monotonic() - self.probed_at > PROBE_TTL.total_seconds()
+
+
+@callback
+def async_store_probe(
+    hass: HomeAssistant, session: MercurySwitchSession, username: str, password: str
+) -> None:
+    """Keep a validated session for the entry setup following the config flow."""
+    probes: dict[str, SwitchProbe] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        KEY_PROBES, {}
+    )
+    for host, probe in list(probes.items()):
+        if probe.expired or host == session.api.host:
+            del probes[host]
+            hass.async_add_executor_job(probe.session.close)
+    probes[session.api.host] = SwitchProbe(session, username, password)
+
+
+@callback
+def async_pop_probe(
+    hass: HomeAssistant, host: str, username: str, password: str
+) -> SwitchProbe | None:
+    """Return the session validated by the config flow for a host, if recent."""
+    probe = hass.data.get(DOMAIN, {}).get(KEY_PROBES, {}).pop(host, None)
+    if probe is None:
+        return None
+    if probe.expired or (probe.username, probe.password) != (username, password):
+        hass.async_add_executor_job(probe.session.close)
+        return None
+    return probe
+
+
+def get_snapshot_store(
+    hass: HomeAssistant, entry_id: str
+) -> Store[dict[str, dict[str, Any]]]:
+    """Return the store of the switch infos saved for a config entry."""
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+def parse_page_infos(
+    api: MercurySwitchConnector,
+    parser: PageParser,
+    page: str,
+    response: BaseResponse | None,
+) -> dict[str, Any]:
+    """Parse a page of the switch web interface, None if it did not load."""
+    if response is None:
+        if page == PAGE_VLAN:
+            return dict(VLAN_DEFAULTS)
+        message = f"Failed to load {page} page"
+        raise PageNotLoadedError(message)
+    _templates_attr, parse_method, needs_ports = SWITCH_PAGES[page]
+    if needs_ports:
+        return getattr(parser, parse_method)(response, api.ports)
+    return getattr(parser, parse_method)(response)
+
+
+def get_page_infos(
+    session: MercurySwitchSession, parser: PageParser, page: str
+) -> dict[str, Any]:
+    """Fetch a single page of the switch web interface and parse it."""
+    templates = getattr(session.api.switch_model, SWITCH_PAGES[page][0])
+    try:
+        response = session.fetch_page_from_templates(templates)
+    except PageNotLoadedError:
+        response = None
+    return parse_page_infos(session.api, parser, page, response)
+
+
+def get_page_infos_queued(
+    submitted: float, session: MercurySwitchSession, parser: PageParser, page: str
+) -> tuple[float, dict[str, Any]]:
+    """Fetch and parse a page, with the seconds the job queued for a thread."""
+    queued = time.monotonic() - submitted
+    return queued, get_page_infos(session, parser, page)
+
+
+async def async_get_page_infos(
+    session: AsyncMercurySwitchSession, parser: PageParser, page: str
+) -> dict[str, Any]:
+    """Fetch a single page of the switch web interface and parse it."""
+    templates = getattr(session.api.switch_model, SWITCH_PAGES[page][0])
+    try:
+        response = await session.async_fetch_page_from_templates(templates)
+    except PageNotLoadedError:
+        response = None
+    return parse_page_infos(session.api, parser, page, response)
 
 
 class HomeAssistantMercurySwitch:
@@ -60,58 +266,359 @@ class HomeAssistantMercurySwitch:
         self._username = entry.data[CONF_USERNAME]
         self._password = entry.data[CONF_PASSWORD]
 
+        # forced state write interval for unchanged entities, None disables it
+        state_heartbeat = entry.options.get(
+            CONF_STATE_HEARTBEAT, DEFAULT_STATE_HEARTBEAT
+        )
+        self.state_heartbeat: float | None = state_heartbeat or None
+        # publish policies of the port sensors, by publish class
+        self.publish_policies = publish_policies(entry.options)
+
+        # state write counters, summed over all entities of this switch
+        self.state_writes = 0
+        self.skipped_state_writes = 0
+
         # set on setup
         self.api: MercurySwitchConnector | None = None
-        self.model: str | None = None
+        self.session: MercurySwitchSession | AsyncMercurySwitchSession | None = None
+        self.async_transport: bool = entry.options.get(CONF_ASYNC_TRANSPORT, False)
+        # seconds each login, model detection and page fetch may take
+        self.timeout: float = entry.options.get(
+            CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
+        )
+        self.model: str | None = entry.data.get(CONF_MODEL)
+        # True while the model cached in the entry data is not confirmed by a poll
+        self.profile_unconfirmed = False
+
+        # monotonic time the last switch infos were fetched at
+        self.fetched_at: float | None = None
+        # seconds the last poll started after it was due
+        self.poll_lag: float | None = None
+        self.port_rates = PortRateTracker(
+            entry.options.get(CONF_RATE_WINDOW, DEFAULT_RATE_WINDOW)
+        )
+        self.poll_stats = PollStats()
+        self.circuit_breaker = CircuitBreaker()
+        self.port_events = PortEvents(hass, entry.entry_id)
+        # hourly statistics replacing the states of the port counter sensors
+        self.counter_statistics: CounterStatistics | None = None
+        if entry.options.get(CONF_COUNTER_STATISTICS, False):
+            if "recorder" in hass.config.components:
+                self.counter_statistics = CounterStatistics(
+                    hass, entry.unique_id, self.device_name
+                )
+            else:
+                _LOGGER.warning(
+                    "%s: counter statistics need the recorder, using sensors instead",
+                    self.device_name,
+                )
+
+        # last switch infos of each polling tier, saved for the next startup
+        self._snapshot: dict[str, dict[str, Any]] = {}
+        self._snapshot_store = get_snapshot_store(hass, entry.entry_id)
 
         # async lock
         self.api_lock = asyncio.Lock()
+        # fetch in flight and its monotonic start time, by pages
+        self._fetches: dict[
+            tuple[str, ...], tuple[float, asyncio.Task[dict[str, Any] | None]]
+        ] = {}
+        self._page_semaphore = asyncio.Semaphore(PAGE_FETCH_CONCURRENCY)
+        self._page_parser = create_page_parser()
 
     def _setup(self) -> bool:
         """Set up the Mercury switch."""
-        self.api = get_api(
-            host=self._host, username=self._username, password=self._password
+        # the model is autodetected again on the next poll if it is still unknown
+        self.session = get_session(
+            host=self._host,
+            username=self._username,
+            password=self._password,
+            profile=self.entry.data,
+            timeout=self.timeout,
         )
-        if not self.api.switch_model or self.api.switch_model.MODEL_NAME == "":
-            _LOGGER.info(
-                "[HomeAssistantMercurySwitch._setup] "
-                "No MercurySwitchConnector switch_model set, "
-                "autodetecting model via MercurySwitchConnector.autodetect_model()"
-            )
+        self.api = self.session.api
+        self.model = self.api.switch_model.MODEL_NAME
+        return True
+
+    async def _async_setup_async_transport(self) -> bool:
+        """Set up the Mercury switch without blocking calls."""
+        self.api = MercurySwitchConnector(self._host, self._username, self._password)
+        session = AsyncMercurySwitchSession(self.hass, self.api, self.timeout)
+        self.session = session
+        if (model := get_cached_model(self.entry.data)) is not None:
+            apply_model(self.api, model, self.entry.data.get(CONF_PORTS))
+        else:
             try:
-                self.api.autodetect_model()
-            except Exception:  # noqa: BLE001
+                await session.async_autodetect_model()
+            except MercurySwitchModelNotDetectedError:
                 _LOGGER.warning("Could not autodetect model", exc_info=True)
-            _LOGGER.info(
-                "[HomeAssistantMercurySwitch._setup] Autodetected model: %s",
-                str(self.api.switch_model.MODEL_NAME),
-            )
+        await session.async_login()
         self.model = self.api.switch_model.MODEL_NAME
         return True
 
     async def async_setup(self) -> bool:
         """Set up the Mercury switch asynchronously."""
+        self.profile_unconfirmed = get_cached_model(self.entry.data) is not None
+        probe = async_pop_probe(self.hass, self._host, self._username, self._password)
         async with self.api_lock:
-            if not await self.hass.async_add_executor_job(self._setup):
-                return False
+            if self.session is not None:
+                # set up by a concurrent poll
+                return True
+            if probe is not None and not self.async_transport:
+                # logged in and detected by the config flow moments ago
+                self.session = probe.session
+                self.api = probe.session.api
+                self.model = self.api.switch_model.MODEL_NAME
+            elif self.async_transport:
+                if probe is not None:
+                    await self.hass.async_add_executor_job(probe.session.close)
+                async with asyncio.timeout(self.timeout * SETUP_REQUESTS):
+                    await self._async_setup_async_transport()
+            else:
+                async with asyncio.timeout(self.timeout * SETUP_REQUESTS):
+                    if not await self.hass.async_add_executor_job(self._setup):
+                        return False
+        self._async_store_profile()
         return True
 
-    async def async_get_switch_infos(self) -> dict[str, Any] | None:
-        """Get switch information asynchronously."""
-        async with self.api_lock:
-            if self.api:
-                return await self.hass.async_add_executor_job(self.api.get_switch_infos)
-        return None
+    @property
+    def ports(self) -> int:
+        """Return the number of ports, from the cached profile until set up."""
+        if self.api is not None:
+            return self.api.ports
+        return self.entry.data.get(CONF_PORTS, 0)
+
+    async def async_load_snapshot(self) -> dict[str, dict[str, Any]] | None:
+        """Return the switch infos saved by the last run, per polling tier."""
+        snapshot = await self._snapshot_store.async_load()
+        if not snapshot or any(tier not in snapshot for tier in TIER_PAGES):
+            return None
+        self._snapshot = snapshot
+        return snapshot
+
+    @callback
+    def async_save_snapshot(self, tier: str, switch_infos: dict[str, Any]) -> None:
+        """Remember the switch infos of a tier and save them after a delay."""
+        self._snapshot[tier] = switch_infos
+        if all(tier in self._snapshot for tier in TIER_PAGES):
+            self._snapshot_store.async_delay_save(
+                self._snapshot_data, SNAPSHOT_SAVE_DELAY
+            )
+
+    @callback
+    def _snapshot_data(self) -> dict[str, dict[str, Any]]:
+        """Return the snapshot to save."""
+        return self._snapshot
+
+    @callback
+    def _async_store_profile(self) -> None:
+        """Cache the detected model and port count in the entry data."""
+        if not self.api or not self.api.switch_model.MODEL_NAME:
+            return
+        profile = {
+            CONF_MODEL: self.api.switch_model.MODEL_NAME,
+            CONF_PORTS: self.api.ports,
+        }
+        if all(self.entry.data.get(key) == value for key, value in profile.items()):
+            return
+        _LOGGER.debug("Caching device profile of %s: %s", self._host, profile)
+        self.hass.config_entries.async_update_entry(
+            self.entry, data={**self.entry.data, **profile}
+        )
+
+    async def async_close(self) -> None:
+        """Close the session to the switch."""
+        self.port_events.async_shutdown()
+        for _started, task in self._fetches.values():
+            task.cancel()
+        # the hour in progress is imported as is, later polls overwrite it
+        if self.counter_statistics is not None:
+            await self.counter_statistics.async_import(flush=True)
+        # the aiohttp session is shared and closed by Home Assistant
+        if isinstance(self.session, MercurySwitchSession):
+            await self.hass.async_add_executor_job(self.session.close)
+
+    async def _async_get_page_infos(self, page: str) -> dict[str, Any]:
+        """Fetch and parse a page, limited to a few concurrent pages per switch."""
+        async with (
+            self._page_semaphore,
+            asyncio.timeout(self.timeout * PAGE_REQUESTS),
+        ):
+            if isinstance(self.session, AsyncMercurySwitchSession):
+                return await async_get_page_infos(self.session, self._page_parser, page)
+            queued, page_infos = await self.hass.async_add_executor_job(
+                get_page_infos_queued,
+                time.monotonic(),
+                self.session,
+                self._page_parser,
+                page,
+            )
+            self.poll_stats.record_executor_wait(queued)
+            return page_infos
+
+    async def _async_detect_model(self) -> None:
+        """Detect the switch model and cache it in the entry data."""
+        async with asyncio.timeout(self.timeout):
+            if isinstance(self.session, AsyncMercurySwitchSession):
+                await self.session.async_autodetect_model()
+            else:
+                await self.hass.async_add_executor_job(self.api.autodetect_model)
+        self.model = self.api.switch_model.MODEL_NAME
+        self._async_store_profile()
+
+    async def _async_verify_profile(self) -> None:
+        """Detect the model again after pages did not load with the cached one."""
+        cached_model = self.model
+        try:
+            await self._async_detect_model()
+        except (*SWITCH_ERRORS, TimeoutError) as ex:
+            # e.g. the switch is rebooting, the cached profile is tried again
+            _LOGGER.debug("Could not verify the model of %s: %s", self._host, ex)
+            return
+        self.profile_unconfirmed = False
+        if self.model != cached_model:
+            _LOGGER.warning(
+                "Cached model %s of %s does not match the switch, detected %s",
+                cached_model,
+                self._host,
+                self.model,
+            )
+
+    async def _async_get_pages_infos(self, pages: tuple[str, ...]) -> dict[str, Any]:
+        """Fetch the given pages concurrently and merge them into one dict."""
+        if self.api and not self.api.switch_model.MODEL_NAME:
+            await self._async_detect_model()
+        switch_infos: dict[str, Any] = {}
+        try:
+            results = await asyncio.gather(
+                *(self._async_get_page_infos(page) for page in pages)
+            )
+        except (PageNotLoadedError, MercurySwitchPageParserError):
+            if self.profile_unconfirmed:
+                await self._async_verify_profile()
+            raise
+        # the cached profile is confirmed once the port pages parsed with it
+        if PAGE_PORT_SETTING in pages:
+            self.profile_unconfirmed = False
+        for page_infos in results:
+            switch_infos.update(page_infos)
+        return switch_infos
+
+    async def async_get_switch_infos(
+        self, tier: str | None = None, *, fresh: bool = False
+    ) -> dict[str, Any] | None:
+        """
+        Get switch information of a polling tier, or all of it, asynchronously.
+
+        Callers overlapping a fetch of the same pages, started within the
+        coalesce window, share its result unless they ask for `fresh` data.
+        """
+        if tier is None:
+            pages = tuple(page for pages in TIER_PAGES.values() for page in pages)
+        else:
+            pages = TIER_PAGES[tier]
+        now = time.monotonic()
+        fetch = self._fetches.get(pages)
+        if (
+            not fresh
+            and fetch is not None
+            and now - fetch[0] <= FETCH_COALESCE_WINDOW.total_seconds()
+        ):
+            self.poll_stats.coalesced += 1
+            return await asyncio.shield(fetch[1])
+        task = self.entry.async_create_task(
+            self.hass,
+            self._async_poll(pages),
+            f"{self.device_name} poll",
+            eager_start=False,
+        )
+        self._fetches[pages] = (now, task)
+        task.add_done_callback(partial(self._async_poll_done, pages))
+        # a cancelled caller leaves the fetch to the others sharing it
+        return await asyncio.shield(task)
+
+    @callback
+    def _async_poll_done(
+        self, pages: tuple[str, ...], task: asyncio.Task[dict[str, Any] | None]
+    ) -> None:
+        """Stop sharing a finished fetch, unless a fresh one replaced it."""
+        if (fetch := self._fetches.get(pages)) is not None and fetch[1] is task:
+            del self._fetches[pages]
+        # the error of a fetch nobody awaits anymore is not logged as unretrieved
+        if not task.cancelled():
+            task.exception()
+
+    async def _async_poll(self, pages: tuple[str, ...]) -> dict[str, Any] | None:
+        """Fetch the given pages, unless the circuit breaker paused polls."""
+        if not self.circuit_breaker.allow():
+            msg = (
+                f"{self.device_name} is unreachable, "
+                f"retrying in {self.circuit_breaker.retry_in:.0f}s"
+            )
+            raise SwitchUnreachableError(msg)
+        started = time.monotonic()
+        lock_wait = 0.0
+        relogins = self.session.relogin_count if self.session else 0
+        try:
+            if self.session is None:
+                # setup was deferred, startup used the saved snapshot
+                await self.async_setup()
+            waiting_since = time.monotonic()
+            async with self.api_lock:
+                lock_wait = time.monotonic() - waiting_since
+                switch_infos = await self._async_fetch_switch_infos(pages)
+        except Exception:
+            self._record_poll(started, lock_wait, relogins, failed=True)
+            self.circuit_breaker.record_failure()
+            raise
+        self.circuit_breaker.record_success()
+        if switch_infos is not None:
+            self._record_poll(started, lock_wait, relogins, failed=False)
+        return switch_infos
+
+    async def _async_fetch_switch_infos(
+        self, pages: tuple[str, ...]
+    ) -> dict[str, Any] | None:
+        """Fetch the switch infos of the given pages, called holding the api lock."""
+        if not self.api or not self.session:
+            return None
+        switch_infos = await self._async_get_pages_infos(pages)
+        if PAGE_PORT_STATISTICS in pages:
+            self.fetched_at = time.monotonic()
+            switch_infos.update(
+                self.port_rates.update(switch_infos, self.api.ports, self.fetched_at)
+            )
+            if self.counter_statistics is not None and self.counter_statistics.update(
+                switch_infos, self.api.ports, dt_util.utcnow()
+            ):
+                self.entry.async_create_background_task(
+                    self.hass,
+                    self.counter_statistics.async_import(),
+                    f"{self.device_name} counter statistics import",
+                )
+        return switch_infos
+
+    def _record_poll(
+        self, started: float, lock_wait: float, relogins: int, *, failed: bool
+    ) -> None:
+        """Add the timings of a poll to the poll statistics."""
+        retries = self.session.relogin_count - relogins if self.session else 0
+        self.poll_stats.record_poll(
+            time.monotonic() - started, lock_wait, failed=failed, retries=retries
+        )
 
 
 class MercurySwitchCoordinatorEntity(CoordinatorEntity):
     """Base class for a Mercury switch entity."""
 
     def __init__(
-        self, coordinator: DataUpdateCoordinator, switch: HomeAssistantMercurySwitch
+        self,
+        coordinator: DataUpdateCoordinator,
+        switch: HomeAssistantMercurySwitch,
+        context: str | None = None,
     ) -> None:
-        """Initialize a Mercury device."""
-        super().__init__(coordinator)
+        """Initialize a Mercury device, updated on changes of `context` if given."""
+        super().__init__(coordinator, context)
         self._switch = switch
         self._name = switch.device_name
         self._unique_id = switch.unique_id
@@ -140,21 +647,96 @@ class MercurySwitchCoordinatorEntity(CoordinatorEntity):
 
 
 class MercurySwitchAPICoordinatorEntity(MercurySwitchCoordinatorEntity):
-    """Base class for a Mercury switch entity."""
+    """
+    Base class for a Mercury switch entity.
+
+    State is only written when the value or availability changed since the
+    last write, or when the switch's state heartbeat interval has elapsed.
+    Value changes are further held back by the entity's publish policy; the
+    latest value is written once the policy's interval is over.
+    """
+
+    _publish_policy: PublishPolicy | None = None
 
     def __init__(
-        self, coordinator: DataUpdateCoordinator, switch: HomeAssistantMercurySwitch
+        self,
+        coordinator: DataUpdateCoordinator,
+        switch: HomeAssistantMercurySwitch,
+        context: str | None = None,
     ) -> None:
         """Initialize a Mercury device."""
-        super().__init__(coordinator, switch)
+        super().__init__(coordinator, switch, context)
+        self._value: Any = None
+        self._written_state: tuple[bool, Any] | None = None
+        self._written_at = 0.0
+        self._publish_timer: CALLBACK_TYPE | None = None
+        self.skipped_state_writes = 0
 
     @abstractmethod
     @callback
     def async_update_device(self) -> None:
         """Update the Mercury device."""
 
+    def _should_write_state(self) -> bool:
+        """Return True if the current state differs from the last written one."""
+        written = self._written_state
+        elapsed = time.monotonic() - self._written_at
+        if written != (self.available, self._value):
+            return self._should_publish(written, elapsed)
+        heartbeat = self._switch.state_heartbeat
+        return heartbeat is not None and elapsed >= heartbeat
+
+    def _should_publish(self, written: tuple[bool, Any] | None, elapsed: float) -> bool:
+        """Return True if the publish policy lets a changed value be written."""
+        policy = self._publish_policy
+        # availability changes and values becoming known are always written
+        if (
+            policy is None
+            or written is None
+            or written[0] != self.available
+            or written[1] is None
+            or self._value is None
+        ):
+            return True
+        if policy.should_publish(written[1], self._value, elapsed):
+            return True
+        if policy.interval and self._publish_timer is None:
+            self._publish_timer = async_call_later(
+                self.hass, policy.interval - elapsed, self._async_publish_pending
+            )
+        return False
+
+    @callback
+    def _async_publish_pending(self, _now: datetime) -> None:
+        """Write the value held back by the publish policy."""
+        self._publish_timer = None
+        if self._written_state != (self.available, self._value):
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember what was written."""
+        if self._publish_timer is not None:
+            self._publish_timer()
+            self._publish_timer = None
+        self._written_state = (self.available, self._value)
+        self._written_at = time.monotonic()
+        self._switch.state_writes += 1
+        super().async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the write of a held back value."""
+        if self._publish_timer is not None:
+            self._publish_timer()
+            self._publish_timer = None
+        await super().async_will_remove_from_hass()
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self.async_update_device()
+        if not self._should_write_state():
+            self.skipped_state_writes += 1
+            self._switch.skipped_state_writes += 1
+            return
         super()._handle_coordinator_update()
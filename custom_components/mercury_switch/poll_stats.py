@@ -0,0 +1,58 @@
+"""Rolling poll timings of a Mercury Switch."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+
+from .const import POLL_STATS_SIZE
+
+
+def percentile(values: deque[float], percent: float) -> float | None:
+    """Return the nearest-rank percentile of the values, None if there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class PollStats:
+    """Keep the timings and outcomes of the last polls of a switch."""
+
+    def __init__(self, size: int = POLL_STATS_SIZE) -> None:
+        """Initialize the statistics of the last `size` polls."""
+        self.latencies: deque[float] = deque(maxlen=size)
+        self.lock_waits: deque[float] = deque(maxlen=size)
+        self.executor_waits: deque[float] = deque(maxlen=size)
+        self._failed: deque[bool] = deque(maxlen=size)
+        self.failures = 0
+        self.retries = 0
+        # polls answered by a fetch already in flight
+        self.coalesced = 0
+
+    @property
+    def last_latency(self) -> float | None:
+        """Return the seconds the last poll took."""
+        return self.latencies[-1] if self.latencies else None
+
+    @property
+    def error_rate(self) -> float | None:
+        """Return the percentage of the last polls which failed."""
+        if not self._failed:
+            return None
+        return 100 * sum(self._failed) / len(self._failed)
+
+    def record_poll(
+        self, latency: float, lock_wait: float, *, failed: bool, retries: int = 0
+    ) -> None:
+        """Add the timings and outcome of a poll."""
+        self.latencies.append(latency)
+        self.lock_waits.append(lock_wait)
+        self._failed.append(failed)
+        self.failures += failed
+        self.retries += retries
+
+    def record_executor_wait(self, wait: float) -> None:
+        """Add the seconds a page fetch queued for an executor thread."""
+        self.executor_waits.append(wait)
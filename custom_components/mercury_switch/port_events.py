@@ -0,0 +1,122 @@
+"""Debounced link transition events of Mercury Switch ports."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+
+from .const import (
+    EVENT_PORT,
+    PORT_EVENT_COOLDOWN,
+    PORT_EVENT_FLAP,
+    PORT_EVENT_LINK_DOWN,
+    PORT_EVENT_LINK_UP,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .snapshot import PortTable, SnapshotChange
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PortTransition:
+    """Link transitions of a port during one debounce window."""
+
+    was_up: bool
+    up: bool | None
+    old_speed: str | None
+    new_speed: str | None
+    flaps: int = 1
+
+    @property
+    def event_type(self) -> str:
+        """Return the event type, a flap if the port went back to where it was."""
+        if self.up == self.was_up:
+            return PORT_EVENT_FLAP
+        return PORT_EVENT_LINK_UP if self.up else PORT_EVENT_LINK_DOWN
+
+
+class PortEvents:
+    """
+    Fire one event per port for the link transitions of a debounce window.
+
+    Transitions seen by consecutive polls within the window are merged, the
+    event carries how often the link went up or down meanwhile.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the port events of a switch."""
+        self.hass = hass
+        self._entry_id = entry_id
+        self._pending: dict[int, PortTransition] = {}
+        self._listeners: dict[object, Callable[[str, dict[str, Any]], None]] = {}
+        self._debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=PORT_EVENT_COOLDOWN.total_seconds(),
+            immediate=False,
+            function=self._async_fire,
+        )
+
+    @callback
+    def async_add_listener(
+        self, update_callback: Callable[[str, dict[str, Any]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for port events, called with the event type and data."""
+        token = object()
+        self._listeners[token] = update_callback
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.pop(token, None)
+
+        return remove_listener
+
+    @callback
+    def async_add_transitions(self, change: SnapshotChange, ports: PortTable) -> None:
+        """Add the link transitions of a poll, fired once the window is over."""
+        for port, was_up in change.link_transitions.items():
+            up = ports.status(port)
+            speed = ports.get(port, "connection_speed")
+            pending = self._pending.get(port)
+            if pending is None:
+                self._pending[port] = PortTransition(
+                    was_up, up, change.previous_speeds.get(port, speed), speed
+                )
+            else:
+                pending.up = up
+                pending.new_speed = speed
+                pending.flaps += 1
+        if change.link_transitions:
+            self._debouncer.async_schedule_call()
+
+    @callback
+    def _async_fire(self) -> None:
+        """Fire the events of the transitions of the window."""
+        pending, self._pending = self._pending, {}
+        for port, transition in pending.items():
+            event_type = transition.event_type
+            data = {
+                "config_entry_id": self._entry_id,
+                "type": event_type,
+                "port": port,
+                "old_speed": transition.old_speed,
+                "new_speed": transition.new_speed,
+                "flaps": transition.flaps,
+            }
+            self.hass.bus.async_fire(EVENT_PORT, data)
+            for update_callback in list(self._listeners.values()):
+                update_callback(event_type, data)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop the pending transitions and stop the debounce timer."""
+        self._pending.clear()
+        self._debouncer.async_shutdown()
@@ -0,0 +1,55 @@
+"""Packet rates derived from Mercury Switch port counters."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+from .const import DEFAULT_RATE_WINDOW, RATE_HISTORY_SIZE
+
+# counter key suffix -> derived rate key suffix
+RATE_COUNTERS = {
+    "tx_good": "tx_rate",
+    "rx_good": "rx_rate",
+}
+MIN_RATE_SAMPLES = 2
+
+
+class PortRateTracker:
+    """Compute per-port packets per second from consecutive counter snapshots."""
+
+    def __init__(self, window: int = DEFAULT_RATE_WINDOW) -> None:
+        """Initialize the tracker with a smoothing window of `window` samples."""
+        self.window = max(MIN_RATE_SAMPLES, min(window, RATE_HISTORY_SIZE))
+        self._history: dict[tuple[int, str], deque[tuple[float, int]]] = {}
+
+    def update(
+        self, switch_infos: dict[str, Any], ports: int, fetched_at: float
+    ) -> dict[str, float | None]:
+        """Add the counters of a snapshot fetched at `fetched_at` and return rates."""
+        rates: dict[str, float | None] = {}
+        for port in range(1, ports + 1):
+            for counter, rate in RATE_COUNTERS.items():
+                value = switch_infos.get(f"port_{port}_{counter}")
+                if not isinstance(value, int):
+                    continue
+                history = self._history.setdefault(
+                    (port, counter), deque(maxlen=RATE_HISTORY_SIZE)
+                )
+                # counters went backwards, the switch rebooted or was reset
+                if history and value < history[-1][1]:
+                    history.clear()
+                history.append((fetched_at, value))
+                rates[f"port_{port}_{rate}"] = self._rate(history)
+        return rates
+
+    def _rate(self, history: deque[tuple[float, int]]) -> float | None:
+        """Return the average rate over the last `window` samples."""
+        if len(history) < MIN_RATE_SAMPLES:
+            return None
+        first_at, first_value = history[-min(self.window, len(history))]
+        last_at, last_value = history[-1]
+        elapsed = last_at - first_at
+        if elapsed <= 0:
+            return None
+        return round((last_value - first_value) / elapsed, 2)
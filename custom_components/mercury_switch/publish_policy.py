@@ -0,0 +1,65 @@
+"""State publish downsampling of Mercury Switch sensors."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    CONF_PUBLISH_INTERVAL,
+    CONF_PUBLISH_THRESHOLD,
+    PUBLISH_CLASSES,
+    PUBLISH_THRESHOLD_CLASSES,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+@dataclass(frozen=True)
+class PublishPolicy:
+    """Minimum interval and relative change between published states."""
+
+    # seconds, 0 publishes changes without waiting
+    interval: float = 0.0
+    # percent of the published value, 0 publishes changes of any size
+    threshold: float = 0.0
+
+    def should_publish(self, published: Any, value: Any, elapsed: float) -> bool:
+        """Return True if `value` is due, `elapsed` seconds after `published`."""
+        if self.interval and elapsed >= self.interval:
+            return True
+        if self.threshold:
+            return self.threshold_crossed(published, value)
+        return not self.interval
+
+    def threshold_crossed(self, published: Any, value: Any) -> bool:
+        """Return True if `value` differs from `published` by the threshold."""
+        if not _is_number(published) or not _is_number(value):
+            return True
+        if published == 0:
+            return value != 0
+        return abs(value - published) * 100 >= self.threshold * abs(published)
+
+
+def _is_number(value: Any) -> bool:
+    """Return True for int and float values, which bools are not."""
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def publish_policies(options: Mapping[str, Any]) -> dict[str, PublishPolicy]:
+    """Return the policies configured in the entry options, by publish class."""
+    policies = {}
+    for publish_class in PUBLISH_CLASSES:
+        threshold = 0
+        if publish_class in PUBLISH_THRESHOLD_CLASSES:
+            threshold = options.get(
+                CONF_PUBLISH_THRESHOLD.format(publish_class=publish_class), 0
+            )
+        policy = PublishPolicy(
+            options.get(CONF_PUBLISH_INTERVAL.format(publish_class=publish_class), 0),
+            threshold,
+        )
+        if policy.interval or policy.threshold:
+            policies[publish_class] = policy
+    return policies
@@ -0,0 +1,66 @@
+"""Domain-wide poll scheduling for Mercury Switches."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from .const import DOMAIN, KEY_SCHEDULER, MAX_CONCURRENT_SWITCH_POLLS
+
+if TYPE_CHECKING:
+    from datetime import timedelta
+
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def poll_phase(slot: int) -> float:
+    """
+    Return the fraction of the interval to offset the polls of a slot by.
+
+    The fractions form a van der Corput sequence (0, 1/2, 1/4, 3/4, ...), so
+    polls stay evenly spread however many switches are registered.
+    """
+    phase = 0.0
+    denominator = 1
+    while slot:
+        denominator *= 2
+        slot, remainder = divmod(slot, 2)
+        phase += remainder / denominator
+    return phase
+
+
+class MercurySwitchPollScheduler:
+    """Stagger the polls of all switches and limit how many run at once."""
+
+    def __init__(self, max_concurrent_polls: int = MAX_CONCURRENT_SWITCH_POLLS) -> None:
+        """Initialize the scheduler."""
+        self.semaphore = asyncio.Semaphore(max_concurrent_polls)
+        # slot of each config entry, per polling tier
+        self._slots: dict[str, dict[str, int]] = {}
+
+    def register(self, tier: str, entry_id: str, interval: timedelta) -> timedelta:
+        """Reserve a slot for the polls of an entry and return their offset."""
+        slots = self._slots.setdefault(tier, {})
+        if entry_id not in slots:
+            used_slots = set(slots.values())
+            slots[entry_id] = next(
+                slot for slot in range(len(used_slots) + 1) if slot not in used_slots
+            )
+        offset = interval * poll_phase(slots[entry_id])
+        _LOGGER.debug("%s polls of %s are offset by %s", tier, entry_id, offset)
+        return offset
+
+    def unregister(self, tier: str, entry_id: str) -> None:
+        """Release the slot of an entry's polls."""
+        self._slots.get(tier, {}).pop(entry_id, None)
+
+
+def get_scheduler(hass: HomeAssistant) -> MercurySwitchPollScheduler:
+    """Return the poll scheduler shared by all Mercury switches."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if KEY_SCHEDULER not in domain_data:
+        domain_data[KEY_SCHEDULER] = MercurySwitchPollScheduler()
+    return domain_data[KEY_SCHEDULER]
@@ -4,25 +4,49 @@ from __future__ import annotations
 
 import logging
 from collections import OrderedDict
+from functools import cache
 from typing import TYPE_CHECKING
 
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorStateClass,
 )
-from homeassistant.const import EntityCategory
+from homeassistant.const import PERCENTAGE, EntityCategory, Platform, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    DOMAIN,
+    PUBLISH_COUNTERS,
+    PUBLISH_LINK_SPEED,
+    PUBLISH_RATES,
+    TIER_SLOW,
+)
+from .counter_statistics import STATISTIC_COUNTERS
+from .poll_stats import percentile
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
     from . import MercurySwitchConfigEntry
+    from .mercury_switch import HomeAssistantMercurySwitch
+    from .snapshot import SwitchSnapshot
 from .mercury_entities import (
     MercurySwitchRouterSensorEntity,
     MercurySwitchSensorEntityDescription,
+    MercurySwitchStatsSensorEntity,
+    MercurySwitchStatsSensorEntityDescription,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# port sensors replaced by statistics with the counter statistics option
+COUNTER_SENSOR_SUFFIXES = tuple(f"_{counter}" for counter in STATISTIC_COUNTERS)
 
 DEVICE_SENSOR_TYPES = [
     MercurySwitchSensorEntityDescription(
@@ -32,6 +56,7 @@ DEVICE_SENSOR_TYPES = [
         native_unit_of_measurement=None,
         device_class=None,
         icon="mdi:text",
+        tier=TIER_SLOW,
     ),
     MercurySwitchSensorEntityDescription(
         key="switch_hardware",
@@ -40,6 +65,7 @@ DEVICE_SENSOR_TYPES = [
         native_unit_of_measurement=None,
         device_class=None,
         icon="mdi:text",
+        tier=TIER_SLOW,
     ),
     MercurySwitchSensorEntityDescription(
         key="switch_mac",
@@ -48,6 +74,7 @@ DEVICE_SENSOR_TYPES = [
         native_unit_of_measurement=None,
         device_class=None,
         icon="mdi:network",
+        tier=TIER_SLOW,
     ),
     MercurySwitchSensorEntityDescription(
         key="switch_ip",
@@ -56,6 +83,177 @@ DEVICE_SENSOR_TYPES = [
         native_unit_of_measurement=None,
         device_class=None,
         icon="mdi:ip-network",
+        tier=TIER_SLOW,
+    ),
+]
+
+SWITCH_STATS_SENSOR_TYPES = [
+    MercurySwitchStatsSensorEntityDescription(
+        key="state_writes",
+        name="State Writes",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:database-edit",
+        value=lambda switch: switch.state_writes,
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="skipped_state_writes",
+        name="Skipped State Writes",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:database-off",
+        value=lambda switch: switch.skipped_state_writes,
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="session_age",
+        name="Session Age",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=0,
+        icon="mdi:account-clock",
+        value=lambda switch: switch.session.session_age if switch.session else None,
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="session_relogins",
+        name="Session Re-logins",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:account-reactivate",
+        value=lambda switch: switch.session.relogin_count if switch.session else None,
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="poll_lag",
+        name="Poll Lag",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:timer-sand",
+        value=lambda switch: switch.poll_lag,
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="poll_latency",
+        name="Poll Latency",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        icon="mdi:timer-outline",
+        value=lambda switch: switch.poll_stats.last_latency,
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="poll_latency_p50",
+        name="Poll Latency p50",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        icon="mdi:timer-outline",
+        value=lambda switch: percentile(switch.poll_stats.latencies, 50),
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="poll_latency_p95",
+        name="Poll Latency p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        icon="mdi:timer-alert-outline",
+        value=lambda switch: percentile(switch.poll_stats.latencies, 95),
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="poll_lock_wait",
+        name="Poll Lock Wait p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        icon="mdi:lock-clock",
+        value=lambda switch: percentile(switch.poll_stats.lock_waits, 95),
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="poll_executor_wait",
+        name="Poll Executor Wait p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        icon="mdi:tray-full",
+        value=lambda switch: percentile(switch.poll_stats.executor_waits, 95),
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="poll_error_rate",
+        name="Poll Error Rate",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        icon="mdi:alert-circle-outline",
+        value=lambda switch: switch.poll_stats.error_rate,
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="poll_failures",
+        name="Poll Failures",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:alert-circle",
+        value=lambda switch: switch.poll_stats.failures,
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="poll_retries",
+        name="Poll Retries",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:reload-alert",
+        value=lambda switch: switch.poll_stats.retries,
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="poll_coalesced",
+        name="Coalesced Polls",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:call-merge",
+        value=lambda switch: switch.poll_stats.coalesced,
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="circuit_breaker",
+        name="Circuit Breaker",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.ENUM,
+        options=[CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN],
+        icon="mdi:electric-switch",
+        value=lambda switch: switch.circuit_breaker.state,
+    ),
+    MercurySwitchStatsSensorEntityDescription(
+        key="circuit_breaker_trips",
+        name="Circuit Breaker Trips",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:electric-switch-closed",
+        value=lambda switch: switch.circuit_breaker.trips,
     ),
 ]
 
@@ -65,6 +263,7 @@ PORT_TEMPLATE = OrderedDict(
             "name": "Port {port} Speed",
             "native_unit_of_measurement": None,
             "device_class": None,
+            "publish_class": PUBLISH_LINK_SPEED,
             "icon": "mdi:speedometer",
         },
         "port_{port}_tx_good": {
@@ -72,6 +271,7 @@ PORT_TEMPLATE = OrderedDict(
             "native_unit_of_measurement": "packets",
             "device_class": None,
             "state_class": SensorStateClass.TOTAL_INCREASING,
+            "publish_class": PUBLISH_COUNTERS,
             "icon": "mdi:upload",
         },
         "port_{port}_rx_good": {
@@ -79,8 +279,29 @@ PORT_TEMPLATE = OrderedDict(
             "native_unit_of_measurement": "packets",
             "device_class": None,
             "state_class": SensorStateClass.TOTAL_INCREASING,
+            "publish_class": PUBLISH_COUNTERS,
             "icon": "mdi:download",
         },
+        "port_{port}_tx_rate": {
+            "name": "Port {port} TX Rate",
+            "native_unit_of_measurement": "packets/s",
+            "device_class": None,
+            "state_class": SensorStateClass.MEASUREMENT,
+            "suggested_display_precision": 1,
+            "entity_registry_enabled_default": False,
+            "publish_class": PUBLISH_RATES,
+            "icon": "mdi:upload-network",
+        },
+        "port_{port}_rx_rate": {
+            "name": "Port {port} RX Rate",
+            "native_unit_of_measurement": "packets/s",
+            "device_class": None,
+            "state_class": SensorStateClass.MEASUREMENT,
+            "suggested_display_precision": 1,
+            "entity_registry_enabled_default": False,
+            "publish_class": PUBLISH_RATES,
+            "icon": "mdi:download-network",
+        },
     }
 )
 
@@ -131,13 +352,147 @@ VLAN_GLOBAL_SENSORS = OrderedDict(
 )
 
 
+VLAN_GLOBAL_SENSOR_TYPES = tuple(
+    MercurySwitchSensorEntityDescription(
+        key=vlan_sensor_key,
+        name=vlan_sensor_data["name"],
+        native_unit_of_measurement=vlan_sensor_data.get("native_unit_of_measurement"),
+        device_class=vlan_sensor_data.get("device_class"),
+        icon=vlan_sensor_data.get("icon"),
+        tier=TIER_SLOW,
+    )
+    for vlan_sensor_key, vlan_sensor_data in VLAN_GLOBAL_SENSORS.items()
+)
+
+
+@cache
+def _port_sensor_descriptions(
+    port_nr: int,
+) -> tuple[MercurySwitchSensorEntityDescription, ...]:
+    """Return the sensor descriptions of a port, shared by all switches."""
+    return tuple(
+        MercurySwitchSensorEntityDescription(
+            key=port_sensor_key.format(port=port_nr),
+            name=port_sensor_data["name"].format(port=port_nr),
+            native_unit_of_measurement=port_sensor_data.get(
+                "native_unit_of_measurement"
+            ),
+            device_class=port_sensor_data.get("device_class"),
+            state_class=port_sensor_data.get("state_class"),
+            suggested_display_precision=port_sensor_data.get(
+                "suggested_display_precision"
+            ),
+            entity_registry_enabled_default=port_sensor_data.get(
+                "entity_registry_enabled_default", True
+            ),
+            icon=port_sensor_data.get("icon"),
+            publish_class=port_sensor_data.get("publish_class"),
+        )
+        for port_sensor_key, port_sensor_data in PORT_TEMPLATE.items()
+    )
+
+
+@cache
+def port_sensor_descriptions(
+    ports_cnt: int,
+) -> tuple[MercurySwitchSensorEntityDescription, ...]:
+    """Return the sensor descriptions of all ports of a switch, built once."""
+    return tuple(
+        description
+        for port_nr in range(1, ports_cnt + 1)
+        for description in _port_sensor_descriptions(port_nr)
+    )
+
+
+@cache
+def vlan_sensor_descriptions(
+    vlan_id: int,
+) -> tuple[MercurySwitchSensorEntityDescription, ...]:
+    """Return the sensor descriptions of a VLAN, shared by all switches."""
+    return tuple(
+        MercurySwitchSensorEntityDescription(
+            key=vlan_sensor_key.format(vlan_id=vlan_id),
+            name=vlan_sensor_data["name"].format(vlan_id=vlan_id),
+            native_unit_of_measurement=vlan_sensor_data.get(
+                "native_unit_of_measurement"
+            ),
+            device_class=vlan_sensor_data.get("device_class"),
+            icon=vlan_sensor_data.get("icon"),
+            tier=TIER_SLOW,
+        )
+        for vlan_sensor_key, vlan_sensor_data in VLAN_TEMPLATE.items()
+    )
+
+
+def _vlan_ids(coordinator: DataUpdateCoordinator[SwitchSnapshot | None]) -> set[int]:
+    """Return the ids of the VLANs in the coordinator's snapshot."""
+    if coordinator.data is None:
+        return set()
+    return coordinator.data.vlan_ids
+
+
+def _vlan_sensor_entities(
+    coordinator: DataUpdateCoordinator,
+    switch: HomeAssistantMercurySwitch,
+    vlan_id: int,
+) -> list[MercurySwitchRouterSensorEntity]:
+    """Return the sensor entities of a VLAN."""
+    return [
+        MercurySwitchRouterSensorEntity(
+            coordinator=coordinator,
+            switch=switch,
+            entity_description=description,
+        )
+        for description in vlan_sensor_descriptions(vlan_id)
+    ]
+
+
+def _with_counter_sensors(
+    hass: HomeAssistant,
+    switch: HomeAssistantMercurySwitch,
+    descriptions: tuple[MercurySwitchSensorEntityDescription, ...],
+    *,
+    enabled: bool,
+) -> tuple[MercurySwitchSensorEntityDescription, ...]:
+    """
+    Return the sensors to add, without the counter sensors unless enabled.
+
+    Registry entries of counter sensors replaced by statistics are disabled
+    instead of removed, keeping their names and history until they come back.
+    """
+    entity_registry = er.async_get(hass)
+    kept = []
+    for description in descriptions:
+        if not description.key.endswith(COUNTER_SENSOR_SUFFIXES):
+            kept.append(description)
+            continue
+        if enabled:
+            kept.append(description)
+        unique_id = f"{switch.unique_id}-{description.key}-{description.index}"
+        entity_id = entity_registry.async_get_entity_id(
+            Platform.SENSOR, DOMAIN, unique_id
+        )
+        if entity_id is None:
+            continue
+        disabled_by = entity_registry.async_get(entity_id).disabled_by
+        if not enabled and disabled_by is None:
+            entity_registry.async_update_entity(
+                entity_id, disabled_by=er.RegistryEntryDisabler.INTEGRATION
+            )
+            # the unavailable state left by the last run is not restored again
+            hass.states.async_remove(entity_id)
+        # entries the user disabled stay disabled
+        elif enabled and disabled_by is er.RegistryEntryDisabler.INTEGRATION:
+            entity_registry.async_update_entity(entity_id, disabled_by=None)
+    return tuple(kept)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: MercurySwitchConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up sensors for Mercury Switch component."""
-    del hass
     switch = entry.runtime_data.switch
     coordinator_switch_infos = entry.runtime_data.coordinator_switch_infos
 
@@ -146,91 +501,90 @@ async def async_setup_entry(
 
     for description in DEVICE_SENSOR_TYPES:
         descr_entity = MercurySwitchRouterSensorEntity(
-            coordinator=coordinator_switch_infos,
+            coordinator=entry.runtime_data.coordinator_for(description.tier),
             switch=switch,
             entity_description=description,
         )
         switch_entities.append(descr_entity)
 
-    if switch.api is None:
+    switch_entities.extend(
+        MercurySwitchStatsSensorEntity(
+            coordinator=entry.runtime_data.coordinator_for(description.tier),
+            switch=switch,
+            entity_description=description,
+        )
+        for description in SWITCH_STATS_SENSOR_TYPES
+    )
+
+    # before a deferred setup the port count comes from the cached profile
+    if switch.api is None and not switch.ports:
         _LOGGER.error("switch.api is None, cannot proceed with setting up sensors.")
         return
 
-    ports_cnt = getattr(switch.api, "ports", 0)
+    ports_cnt = switch.ports
     _LOGGER.info(
         "[sensor.async_setup_entry] setting up Platform.SENSOR for %d Switch Ports",
         ports_cnt,
     )
 
-    # Port sensors
-    for i in range(ports_cnt):
-        port_nr = i + 1
-        for port_sensor_key, port_sensor_data in PORT_TEMPLATE.items():
-            description = MercurySwitchSensorEntityDescription(
-                key=port_sensor_key.format(port=port_nr),
-                name=port_sensor_data["name"].format(port=port_nr),
-                native_unit_of_measurement=port_sensor_data.get(
-                    "native_unit_of_measurement"
-                ),
-                device_class=port_sensor_data.get("device_class"),
-                state_class=port_sensor_data.get("state_class"),
-                icon=port_sensor_data.get("icon"),
-            )
-            port_sensor_entity = MercurySwitchRouterSensorEntity(
-                coordinator=coordinator_switch_infos,
-                switch=switch,
-                entity_description=description,
-            )
-            switch_entities.append(port_sensor_entity)
+    # Port sensors, descriptions are shared by all switches with as many ports
+    port_descriptions = port_sensor_descriptions(ports_cnt)
+    port_descriptions = _with_counter_sensors(
+        hass, switch, port_descriptions, enabled=switch.counter_statistics is None
+    )
+    switch_entities.extend(
+        MercurySwitchRouterSensorEntity(
+            coordinator=entry.runtime_data.coordinator_for(description.tier),
+            switch=switch,
+            entity_description=description,
+        )
+        for description in port_descriptions
+    )
 
     # VLAN global sensors
-    for vlan_sensor_key, vlan_sensor_data in VLAN_GLOBAL_SENSORS.items():
-        description = MercurySwitchSensorEntityDescription(
-            key=vlan_sensor_key,
-            name=vlan_sensor_data["name"],
-            native_unit_of_measurement=vlan_sensor_data.get(
-                "native_unit_of_measurement"
-            ),
-            device_class=vlan_sensor_data.get("device_class"),
-            icon=vlan_sensor_data.get("icon"),
-        )
-        vlan_sensor_entity = MercurySwitchRouterSensorEntity(
+    switch_entities.extend(
+        MercurySwitchRouterSensorEntity(
             coordinator=coordinator_switch_infos,
             switch=switch,
             entity_description=description,
         )
-        switch_entities.append(vlan_sensor_entity)
-
-    # VLAN per-VLAN sensors (dynamically created based on discovered VLANs)
-    if coordinator_switch_infos.data:
-        vlan_count = coordinator_switch_infos.data.get("vlan_count", 0)
-        if vlan_count > 0:
-            # Find all VLAN IDs from the data
-            vlan_ids = []
-            for key in coordinator_switch_infos.data:
-                if key.startswith("vlan_") and key.endswith("_name"):
-                    try:
-                        vlan_id = int(key.replace("vlan_", "").replace("_name", ""))
-                        vlan_ids.append(vlan_id)
-                    except ValueError:
-                        continue
-
-            for vlan_id in vlan_ids:
-                for vlan_sensor_key, vlan_sensor_data in VLAN_TEMPLATE.items():
-                    description = MercurySwitchSensorEntityDescription(
-                        key=vlan_sensor_key.format(vlan_id=vlan_id),
-                        name=vlan_sensor_data["name"].format(vlan_id=vlan_id),
-                        native_unit_of_measurement=vlan_sensor_data.get(
-                            "native_unit_of_measurement"
-                        ),
-                        device_class=vlan_sensor_data.get("device_class"),
-                        icon=vlan_sensor_data.get("icon"),
-                    )
-                    vlan_sensor_entity = MercurySwitchRouterSensorEntity(
-                        coordinator=coordinator_switch_infos,
-                        switch=switch,
-                        entity_description=description,
-                    )
-                    switch_entities.append(vlan_sensor_entity)
+        for description in VLAN_GLOBAL_SENSOR_TYPES
+    )
+
+    # VLAN per-VLAN sensors, added and removed as VLANs are configured
+    vlan_entities: dict[int, list[MercurySwitchRouterSensorEntity]] = {}
+    for vlan_id in _vlan_ids(coordinator_switch_infos):
+        vlan_entities[vlan_id] = _vlan_sensor_entities(
+            coordinator_switch_infos, switch, vlan_id
+        )
+        switch_entities.extend(vlan_entities[vlan_id])
+
+    @callback
+    def _async_update_vlans() -> None:
+        """Add entities for new VLANs and remove those of deleted VLANs."""
+        if coordinator_switch_infos.data is None:
+            return
+        vlan_ids = coordinator_switch_infos.data.vlan_ids
+        entity_registry = er.async_get(hass)
+        for vlan_id in set(vlan_entities) - vlan_ids:
+            _LOGGER.debug("VLAN %d was removed from %s", vlan_id, switch.device_name)
+            for entity in vlan_entities.pop(vlan_id):
+                if entity.registry_entry is not None:
+                    entity_registry.async_remove(entity.entity_id)
+                else:
+                    hass.async_create_task(entity.async_remove())
+        new_entities = []
+        for vlan_id in vlan_ids - set(vlan_entities):
+            _LOGGER.debug("VLAN %d was added to %s", vlan_id, switch.device_name)
+            vlan_entities[vlan_id] = _vlan_sensor_entities(
+                coordinator_switch_infos, switch, vlan_id
+            )
+            new_entities.extend(vlan_entities[vlan_id])
+        if new_entities:
+            async_add_entities(new_entities)
+
+    entry.async_on_unload(
+        coordinator_switch_infos.async_add_listener(_async_update_vlans)
+    )
 
     async_add_entities(switch_entities)
@@ -0,0 +1,128 @@
+"""Services of the Mercury Switch integration."""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import time
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_CYCLES,
+    ATTR_TOP,
+    DEFAULT_PROFILE_CYCLES,
+    DEFAULT_PROFILE_TOP,
+    DOMAIN,
+    SERVICE_PROFILE,
+)
+
+if TYPE_CHECKING:
+    from . import MercurySwitchConfigEntry
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_TOP, default=DEFAULT_PROFILE_TOP): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=50)
+        ),
+    }
+)
+
+
+def write_profile(
+    profiler: cProfile.Profile, path: str, top: int
+) -> list[dict[str, Any]]:
+    """Save the stats of a profile and return its functions with most own time."""
+    profiler.dump_stats(path)
+    stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+    ranked = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+    return [
+        {
+            "function": pstats.func_std_string(function),
+            "calls": calls,
+            "own_seconds": round(own_time, 6),
+            "cumulative_seconds": round(cumulative_time, 6),
+        }
+        for function, (_primitive, calls, own_time, cumulative_time, _callers) in (
+            ranked[:top]
+        )
+    ]
+
+
+def _loaded_entry(hass: HomeAssistant, entry_id: str) -> MercurySwitchConfigEntry:
+    """Return a loaded config entry of the integration."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        message = f"Unknown Mercury switch config entry {entry_id}"
+        raise ServiceValidationError(message)
+    if entry.state is not ConfigEntryState.LOADED:
+        message = f"Mercury switch {entry.title} is not loaded"
+        raise ServiceValidationError(message)
+    return entry
+
+
+async def async_profile(call: ServiceCall) -> ServiceResponse:
+    """Run poll-and-dispatch cycles of a switch under cProfile."""
+    hass = call.hass
+    entry = _loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    runtime_data = entry.runtime_data
+    coordinators = [runtime_data.coordinator_switch_infos]
+    if runtime_data.coordinator_port_infos is not None:
+        coordinators.append(runtime_data.coordinator_port_infos)
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as ex:
+        message = "Another profiler is already running"
+        raise HomeAssistantError(message) from ex
+    # everything running meanwhile is profiled too, including executor threads
+    started = time.perf_counter()
+    try:
+        for _ in range(call.data[ATTR_CYCLES]):
+            for coordinator in coordinators:
+                await coordinator.async_refresh()
+    finally:
+        profiler.disable()
+    elapsed = time.perf_counter() - started
+
+    timestamp = dt_util.utcnow().strftime("%Y%m%d%H%M%S")
+    path = hass.config.path(f"{DOMAIN}_profile_{entry.entry_id}_{timestamp}.prof")
+    top_functions = await hass.async_add_executor_job(
+        write_profile, profiler, path, call.data[ATTR_TOP]
+    )
+    return {
+        "file": path,
+        "cycles": call.data[ATTR_CYCLES],
+        "seconds": round(elapsed, 3),
+        "top_functions": top_functions,
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,341 @@
+"""Login session handling for Mercury Switch."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import requests
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from py_mercury_switch_api import (
+    MercurySwitchModelNotDetectedError,
+    PageNotLoadedError,
+)
+from py_mercury_switch_api.const import LOGIN_URL
+from py_mercury_switch_api.exceptions import (
+    MercurySwitchConnectionError,
+    NotLoggedInError,
+)
+from py_mercury_switch_api.fetcher import BaseResponse, PageFetcher
+from py_mercury_switch_api.models import MODELS, AutodetectedMercuryModel
+from py_mercury_switch_api.parsers import MercurySwitchPageParserError, PageParser
+
+from .const import DEFAULT_CONF_TIMEOUT
+from .errors import CannotLoginError
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from py_mercury_switch_api import MercurySwitchConnector
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REQUEST_TIMEOUT = DEFAULT_CONF_TIMEOUT.total_seconds()
+
+# marker of the login page, served with status 200 once a session expired
+LOGIN_PAGE_MARKER = "logonInfo"
+# marker of the system info page, served without login by some switches
+SYSTEM_INFO_MARKER = "info_ds"
+
+
+def is_login_required(url: str, status_code: int, response_url: str, text: str) -> bool:
+    """Return True if a response shows the session is not (or no longer) valid."""
+    if url.endswith(LOGIN_URL):
+        return False
+    return (
+        status_code == requests.codes.unauthorized
+        or "logon" in response_url.lower()
+        or LOGIN_PAGE_MARKER in text
+    )
+
+
+class KeepAlivePageFetcher(PageFetcher):
+    """PageFetcher sending all requests over one keep-alive HTTP session."""
+
+    def __init__(self, host: str, timeout: float = DEFAULT_REQUEST_TIMEOUT) -> None:
+        """Initialize the fetcher and its HTTP session."""
+        super().__init__(host)
+        self._http = requests.Session()
+        self._timeout = timeout
+
+    def request(
+        self, method: str, url: str, data: dict[str, Any] | None = None
+    ) -> requests.Response:
+        """Make HTTP request, raise NotLoggedInError if the session expired."""
+        cookie_name, cookie_content = self.get_cookie()
+        cookies = (
+            {cookie_name: cookie_content} if cookie_name and cookie_content else {}
+        )
+        try:
+            response = self._http.request(
+                method.upper(),
+                url,
+                data=data,
+                cookies=cookies,
+                timeout=self._timeout,
+            )
+        except (
+            requests.exceptions.Timeout,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+        ) as ex:
+            message = f"Connection error: {ex}"
+            raise MercurySwitchConnectionError(message) from ex
+
+        if is_login_required(url, response.status_code, response.url, response.text):
+            message = "Not logged in"
+            raise NotLoggedInError(message)
+        return response
+
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self._http.close()
+
+
+class BaseMercurySwitchSession:
+    """Login state and statistics of a Mercury switch session."""
+
+    def __init__(self, api: MercurySwitchConnector) -> None:
+        """Initialize the session."""
+        self.api = api
+        self.logged_in_at: float | None = None
+        self.login_count = 0
+        self.relogin_count = 0
+
+    @property
+    def session_age(self) -> float | None:
+        """Return the seconds since the last successful login."""
+        if self.logged_in_at is None:
+            return None
+        return time.monotonic() - self.logged_in_at
+
+    def _logged_in(self) -> None:
+        """Record a successful login."""
+        self.logged_in_at = time.monotonic()
+        self.login_count += 1
+
+    def _session_expired(self) -> None:
+        """Record an expired session before logging in again."""
+        _LOGGER.debug(
+            "Session of %s expired after %.0f seconds, logging in again",
+            self.api.host,
+            self.session_age,
+        )
+        self.relogin_count += 1
+
+
+class MercurySwitchSession(BaseMercurySwitchSession):
+    """Authenticated session of a Mercury switch, reused across polls."""
+
+    def __init__(
+        self, api: MercurySwitchConnector, timeout: float = DEFAULT_REQUEST_TIMEOUT
+    ) -> None:
+        """Initialize the session and route the connector's requests through it."""
+        super().__init__(api)
+        self.fetcher = KeepAlivePageFetcher(api.host, timeout)
+        # the connector has no public way to replace its fetcher
+        api._page_fetcher = self.fetcher  # noqa: SLF001
+        # pages are fetched from several executor threads at once
+        self._login_lock = threading.Lock()
+
+    def login(self) -> None:
+        """Login to the switch, raise CannotLoginError on failure."""
+        self.logged_in_at = None
+        self.fetcher.clear_cookie()
+        if not self.api.get_login_cookie():
+            raise CannotLoginError
+        self._logged_in()
+
+    def fetch_page_from_templates(
+        self, templates: list[dict[str, Any]]
+    ) -> BaseResponse:
+        """Return the first page loaded from templates, login again once if needed."""
+        with self._login_lock:
+            if self.logged_in_at is None:
+                self.login()
+            login_count = self.login_count
+        try:
+            return self._fetch_page_from_templates(templates)
+        except NotLoggedInError:
+            with self._login_lock:
+                # another thread may have logged in again in the meantime
+                if self.login_count == login_count:
+                    self._session_expired()
+                    self.login()
+            return self._fetch_page_from_templates(templates)
+
+    def _fetch_page_from_templates(
+        self, templates: list[dict[str, Any]]
+    ) -> BaseResponse:
+        """Return response for 1st successful request from templates."""
+        for template in templates:
+            url = template["url"].format(host=self.api.host)
+            response = self.fetcher.request(template["method"], url)
+            if self.fetcher.has_ok_status(response):
+                base_response = BaseResponse()
+                base_response.status_code = response.status_code
+                base_response.content = response.content
+                base_response.text = response.text
+                return base_response
+
+        message = f"Failed to load any page of templates: {templates}"
+        raise PageNotLoadedError(message)
+
+    def close(self) -> None:
+        """Close the session's HTTP connection."""
+        self.fetcher.close()
+
+
+class AsyncMercurySwitchSession(BaseMercurySwitchSession):
+    """Authenticated session of a Mercury switch using Home Assistant's aiohttp."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: MercurySwitchConnector,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ) -> None:
+        """Initialize the session on the shared aiohttp client session."""
+        super().__init__(api)
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._http = async_get_clientsession(hass)
+        self._parser = PageParser()
+        self._cookies: dict[str, str] = {}
+        self._login_lock = asyncio.Lock()
+
+    async def _async_request(
+        self, method: str, url: str, data: dict[str, Any] | None = None
+    ) -> BaseResponse:
+        """Make HTTP request, raise NotLoggedInError if the session expired."""
+        headers = {}
+        if self._cookies:
+            headers["Cookie"] = "; ".join(
+                f"{name}={value}" for name, value in self._cookies.items()
+            )
+        try:
+            async with self._http.request(
+                method.upper(),
+                url,
+                data=data,
+                headers=headers,
+                timeout=self._timeout,
+            ) as response:
+                text = await response.text(errors="replace")
+                cookies = {name: c.value for name, c in response.cookies.items()}
+                response_url = str(response.url)
+                status_code = response.status
+        except (aiohttp.ClientError, TimeoutError) as ex:
+            message = f"Connection error: {ex}"
+            raise MercurySwitchConnectionError(message) from ex
+
+        if is_login_required(url, status_code, response_url, text):
+            message = "Not logged in"
+            raise NotLoggedInError(message)
+
+        base_response = BaseResponse()
+        base_response.status_code = status_code
+        base_response.text = text
+        base_response.content = text.encode()
+        if cookies:
+            self._cookies.update(cookies)
+        return base_response
+
+    async def async_autodetect_model(self) -> type[AutodetectedMercuryModel]:
+        """Detect the switch model from the system info page."""
+        for template in AutodetectedMercuryModel.AUTODETECT_TEMPLATES:
+            url = template["url"].format(host=self.api.host)
+            try:
+                response = await self._async_request(template["method"], url)
+            except (MercurySwitchConnectionError, NotLoggedInError) as ex:
+                _LOGGER.debug("Error fetching autodetect page: %s", ex)
+                continue
+            if not response:
+                continue
+            matched_models = [
+                model for model in MODELS if self._model_matches(model, response)
+            ]
+            if len(matched_models) == 1:
+                model = matched_models[0]
+                self.api.switch_model = model
+                self.api.ports = model.PORTS
+                return model
+        message = "Could not detect switch model"
+        raise MercurySwitchModelNotDetectedError(message)
+
+    def _model_matches(
+        self, model: type[AutodetectedMercuryModel], response: BaseResponse
+    ) -> bool:
+        """Return True if the page passes one of the model's checks."""
+        for func_name, expected_results in model().get_autodetect_funcs():
+            try:
+                if getattr(self._parser, func_name)(response) in expected_results:
+                    return True
+            except (AttributeError, MercurySwitchPageParserError):
+                continue
+        return False
+
+    async def async_login(self) -> None:
+        """Login to the switch, raise CannotLoginError on failure."""
+        self.logged_in_at = None
+        self._cookies.clear()
+        template = AutodetectedMercuryModel.LOGIN_TEMPLATE
+        credentials = {"_username": self.api.username, "_password": self.api.password}
+        data = {
+            key: credentials.get(value, value)
+            for key, value in template["params"].items()
+        }
+        try:
+            response = await self._async_request(
+                template["method"], template["url"].format(host=self.api.host), data
+            )
+        except MercurySwitchConnectionError as ex:
+            raise CannotLoginError from ex
+
+        err_type = self._parser.parse_logon_info(response)
+        if (err_type is None and response) or err_type == 0:
+            self._logged_in()
+            return
+
+        # some switches allow access without authentication
+        url = f"http://{self.api.host}/SystemInfoRpm.htm"
+        try:
+            response = await self._async_request("get", url)
+        except (MercurySwitchConnectionError, NotLoggedInError) as ex:
+            raise CannotLoginError from ex
+        if not response or SYSTEM_INFO_MARKER not in response.text:
+            raise CannotLoginError
+        self._logged_in()
+
+    async def async_fetch_page_from_templates(
+        self, templates: list[dict[str, Any]]
+    ) -> BaseResponse:
+        """Return the first page loaded from templates, login again once if needed."""
+        async with self._login_lock:
+            if self.logged_in_at is None:
+                await self.async_login()
+            login_count = self.login_count
+        try:
+            return await self._async_fetch_page_from_templates(templates)
+        except NotLoggedInError:
+            async with self._login_lock:
+                # another page fetch may have logged in again in the meantime
+                if self.login_count == login_count:
+                    self._session_expired()
+                    await self.async_login()
+            return await self._async_fetch_page_from_templates(templates)
+
+    async def _async_fetch_page_from_templates(
+        self, templates: list[dict[str, Any]]
+    ) -> BaseResponse:
+        """Return response for 1st successful request from templates."""
+        for template in templates:
+            url = template["url"].format(host=self.api.host)
+            response = await self._async_request(template["method"], url)
+            if response:
+                return response
+
+        message = f"Failed to load any page of templates: {templates}"
+        raise PageNotLoadedError(message)
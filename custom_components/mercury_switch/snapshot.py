@@ -0,0 +1,354 @@
+"""Typed snapshot of the infos polled from a Mercury switch."""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from dataclasses import dataclass, field, fields
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+from .const import ON_VALUES
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# port_{n}_{field} and vlan_{id}_{field} keys of the switch infos
+TABLE_KEY = re.compile(r"(port|vlan)_(\d+)_(\w+)")
+SYSTEM_KEY_PREFIX = "switch_"
+
+# port values by storage, all indexed by port number
+PORT_COUNTERS = ("tx_good", "tx_bad", "rx_good", "rx_bad")
+PORT_FLAGS = ("state", "status")
+PORT_RATES = ("tx_rate", "rx_rate")
+PORT_TEXTS = ("speed", "connection_speed")
+# port values which change with the traffic, not with the switch state
+TRAFFIC_FIELDS = frozenset(PORT_COUNTERS + PORT_RATES)
+# port values whose previous value a change keeps, for link transitions
+LINK_FIELDS = ("status", "connection_speed")
+# flag value of a port whose state or link status was not reported
+FLAG_UNKNOWN = 2
+
+
+@dataclass(slots=True)
+class SystemInfo:
+    """System information of a switch."""
+
+    model: str | None = None
+    mac: str | None = None
+    ip: str | None = None
+    firmware: str | None = None
+    hardware: str | None = None
+    ports: int | None = None
+
+
+@dataclass(slots=True)
+class VlanInfo:
+    """Name and members of an 802.1Q VLAN."""
+
+    name: str | None = None
+    tagged_ports: str | None = None
+    untagged_ports: str | None = None
+
+
+SYSTEM_FIELDS = frozenset(f.name for f in fields(SystemInfo))
+VLAN_FIELDS = frozenset(f.name for f in fields(VlanInfo))
+
+
+class PortTable:
+    """
+    Port values of a switch, kept in arrays indexed by port number.
+
+    Counters are unsigned 64 bit integers, rates are doubles (NaN while
+    unknown) and on/off values take one byte per port, so the values of a
+    48-port switch fit in a few kilobytes without an object per value. The
+    arrays are updated in place on every poll.
+    """
+
+    __slots__ = ("counters", "flags", "known", "rates", "texts")
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self.counters = {name: array("Q") for name in PORT_COUNTERS}
+        # 1 where the counter of a port was reported
+        self.known = {name: bytearray() for name in PORT_COUNTERS}
+        self.flags = {name: bytearray() for name in PORT_FLAGS}
+        self.rates = {name: array("d") for name in PORT_RATES}
+        self.texts: dict[str, list[str | None]] = {name: [] for name in PORT_TEXTS}
+
+    def __len__(self) -> int:
+        """Return the highest port number the table has room for."""
+        return max(len(self.flags["status"]) - 1, 0)
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if both tables hold the same values."""
+        if not isinstance(other, PortTable):
+            return NotImplemented
+        # rates are compared as bytes, NaN never equals itself
+        return (
+            self.counters == other.counters
+            and self.known == other.known
+            and self.flags == other.flags
+            and self.texts == other.texts
+            and all(
+                rates.tobytes() == other.rates[name].tobytes()
+                for name, rates in self.rates.items()
+            )
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def _grow(self, port: int) -> None:
+        """Make room for the values of a port."""
+        missing = port + 1 - len(self.flags["status"])
+        if missing <= 0:
+            return
+        for counters in self.counters.values():
+            counters.extend([0] * missing)
+        for known in self.known.values():
+            known.extend(bytes(missing))
+        for flags in self.flags.values():
+            flags.extend(bytes([FLAG_UNKNOWN]) * missing)
+        for rates in self.rates.values():
+            rates.extend([math.nan] * missing)
+        for texts in self.texts.values():
+            texts.extend([None] * missing)
+
+    def set(self, port: int, name: str, value: Any) -> bool:
+        """Store a value of a port, return True if it changed."""
+        self._grow(port)
+        if name in self.counters:
+            return self._set_counter(port, name, value)
+        if name in self.flags:
+            flag = int(value in ON_VALUES)
+            changed = self.flags[name][port] != flag
+            self.flags[name][port] = flag
+            return changed
+        if name in self.rates:
+            rate = math.nan if value is None else float(value)
+            previous = self.rates[name][port]
+            self.rates[name][port] = rate
+            return previous != rate and not (math.isnan(previous) and math.isnan(rate))
+        if name in self.texts:
+            changed = self.texts[name][port] != value
+            self.texts[name][port] = value
+            return changed
+        return False
+
+    def _set_counter(self, port: int, name: str, value: Any) -> bool:
+        """Store a counter of a port, return True if it changed."""
+        if not isinstance(value, int) or value < 0:
+            return False
+        counters, known = self.counters[name], self.known[name]
+        if known[port] and counters[port] == value:
+            return False
+        counters[port] = value
+        known[port] = 1
+        return True
+
+    def get(self, port: int, name: str) -> Any:
+        """Return a value of a port, None if it is unknown."""
+        return port_reader(name)(self, port)
+
+    def status(self, port: int) -> bool | None:
+        """Return the link status of a port, None if it is unknown."""
+        return _read_flag(self.flags["status"], port)
+
+    def total_rate(self) -> float:
+        """Return the sum of the known packet rates of all ports."""
+        return sum(
+            rate
+            for rates in self.rates.values()
+            for rate in rates
+            if not math.isnan(rate)
+        )
+
+
+def _read_flag(flags: bytearray, port: int) -> bool | None:
+    """Return an on/off value, None if it is unknown."""
+    if port >= len(flags) or flags[port] == FLAG_UNKNOWN:
+        return None
+    return flags[port] == 1
+
+
+@cache
+def port_reader(name: str) -> Callable[[PortTable, int], Any]:
+    """Return a function reading a value of a port from a table by index."""
+    if name in PORT_COUNTERS:
+
+        def read_counter(table: PortTable, port: int) -> int | None:
+            known = table.known[name]
+            if port >= len(known) or not known[port]:
+                return None
+            return table.counters[name][port]
+
+        return read_counter
+
+    if name in PORT_FLAGS:
+        return lambda table, port: _read_flag(table.flags[name], port)
+
+    if name in PORT_RATES:
+
+        def read_rate(table: PortTable, port: int) -> float | None:
+            rates = table.rates[name]
+            if port >= len(rates) or math.isnan(rates[port]):
+                return None
+            return rates[port]
+
+        return read_rate
+
+    if name in PORT_TEXTS:
+
+        def read_text(table: PortTable, port: int) -> str | None:
+            texts = table.texts[name]
+            return texts[port] if port < len(texts) else None
+
+        return read_text
+
+    return lambda _table, _port: None
+
+
+@dataclass(slots=True)
+class SnapshotChange:
+    """What an update changed in a snapshot."""
+
+    # switch infos keys whose value changed
+    keys: set[str] = field(default_factory=set)
+    # packet counter and rate keys among them
+    traffic_keys: set[str] = field(default_factory=set)
+    # previous link status of the ports which went up or down
+    link_transitions: dict[int, bool] = field(default_factory=dict)
+    # previous link speed of the ports whose link speed changed
+    previous_speeds: dict[int, str | None] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        """Return True if any value changed."""
+        return bool(self.keys)
+
+    @property
+    def state_changed(self) -> bool:
+        """Return True if a value other than a packet counter or rate changed."""
+        return len(self.keys) > len(self.traffic_keys)
+
+    @property
+    def link_changed(self) -> bool:
+        """Return True if a port went up or down."""
+        return bool(self.link_transitions)
+
+
+@dataclass(slots=True)
+class SwitchSnapshot:
+    """Switch infos of the last poll, with ports and VLANs indexed by number."""
+
+    system: SystemInfo = field(default_factory=SystemInfo)
+    ports: PortTable = field(default_factory=PortTable)
+    vlans: dict[int, VlanInfo] = field(default_factory=dict)
+    vlan_enabled: bool | None = None
+    vlan_type: str | None = None
+    vlan_count: int | None = None
+
+    @classmethod
+    def from_switch_infos(cls, switch_infos: dict[str, Any]) -> SwitchSnapshot:
+        """Parse the flat switch infos dict returned by the page parsers."""
+        snapshot = cls()
+        snapshot.update(switch_infos)
+        return snapshot
+
+    def update(self, switch_infos: dict[str, Any]) -> SnapshotChange:
+        """
+        Update the snapshot in place from the flat switch infos of a poll.
+
+        Ports keep their values if a poll does not report them. The VLAN
+        table is replaced, VLANs may have been deleted.
+        """
+        change = SnapshotChange()
+        vlans: dict[int, VlanInfo] = {}
+        has_vlans = False
+        for key, value in switch_infos.items():
+            if match := TABLE_KEY.fullmatch(key):
+                table, number, name = match.groups()
+                if table == "port":
+                    self._update_port(change, key, int(number), name, value)
+                elif name in VLAN_FIELDS:
+                    has_vlans = True
+                    vlan = vlans.get(int(number))
+                    if vlan is None:
+                        vlan = vlans[int(number)] = VlanInfo()
+                    setattr(vlan, name, value)
+            elif key.startswith(SYSTEM_KEY_PREFIX):
+                name = key.removeprefix(SYSTEM_KEY_PREFIX)
+                if name in SYSTEM_FIELDS and getattr(self.system, name) != value:
+                    setattr(self.system, name, value)
+                    change.keys.add(key)
+            elif key in ("vlan_enabled", "vlan_type", "vlan_count"):
+                has_vlans = True
+                if getattr(self, key) != value:
+                    setattr(self, key, value)
+                    change.keys.add(key)
+        if has_vlans and vlans != self.vlans:
+            change.keys.update(_changed_vlan_keys(self.vlans, vlans))
+            self.vlans = vlans
+        return change
+
+    def _update_port(
+        self, change: SnapshotChange, key: str, port: int, name: str, value: Any
+    ) -> None:
+        """Update a value of a port, and record link transitions in `change`."""
+        previous = self.ports.get(port, name) if name in LINK_FIELDS else None
+        if not self.ports.set(port, name, value):
+            return
+        change.keys.add(key)
+        if name in TRAFFIC_FIELDS:
+            change.traffic_keys.add(key)
+        elif name == "connection_speed":
+            change.previous_speeds[port] = previous
+        # a first status is no transition
+        elif name == "status" and previous is not None:
+            change.link_transitions[port] = previous
+
+    @property
+    def vlan_ids(self) -> set[int]:
+        """Return the ids of the configured VLANs."""
+        if not self.vlan_count:
+            return set()
+        return {
+            vlan_id for vlan_id, vlan in self.vlans.items() if vlan.name is not None
+        }
+
+
+def _changed_vlan_keys(
+    previous: dict[int, VlanInfo], current: dict[int, VlanInfo]
+) -> set[str]:
+    """Return the switch infos keys of the VLAN values which differ."""
+    empty = VlanInfo()
+    return {
+        f"vlan_{vlan_id}_{name}"
+        for vlan_id in previous.keys() | current.keys()
+        for name in VLAN_FIELDS
+        if getattr(previous.get(vlan_id, empty), name)
+        != getattr(current.get(vlan_id, empty), name)
+    }
+
+
+@cache
+def value_getter(key: str) -> Callable[[SwitchSnapshot], Any]:
+    """Return a function reading a switch infos key from a snapshot, built once."""
+    if match := TABLE_KEY.fullmatch(key):
+        table, number, name = match.groups()
+        index = int(number)
+        if table == "port":
+            read = port_reader(name)
+            return lambda snapshot: read(snapshot.ports, index)
+
+        def get_vlan_value(snapshot: SwitchSnapshot) -> Any:
+            row = snapshot.vlans.get(index)
+            return None if row is None else getattr(row, name, None)
+
+        return get_vlan_value
+
+    if key.startswith(SYSTEM_KEY_PREFIX):
+        name = key.removeprefix(SYSTEM_KEY_PREFIX)
+        return lambda snapshot: getattr(snapshot.system, name, None)
+    return lambda snapshot: getattr(snapshot, key, None)
@@ -0,0 +1 @@
+"""Benchmarks for the Mercury Switch integration."""
@@ -0,0 +1,44 @@
+"""Pytest fixtures for Mercury Switch integration benchmarks."""
+
+import json
+import os
+import platform
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from tests.simulator import MercurySwitchSimulator, SimulatorConfig
+
+# path of the JSON file the results are written to, benchmarks are skipped if unset
+BENCHMARK_OUTPUT = os.environ.get("MERCURY_SWITCH_BENCHMARK")
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Skip the benchmarks unless an output file is given."""
+    if BENCHMARK_OUTPUT:
+        return
+    skip = pytest.mark.skip(reason="set MERCURY_SWITCH_BENCHMARK to run benchmarks")
+    for item in items:
+        if "benchmarks" in item.nodeid:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results() -> Iterator[list[dict[str, Any]]]:
+    """Collect the benchmark results and write them to the output file."""
+    results: list[dict[str, Any]] = []
+    yield results
+    if BENCHMARK_OUTPUT and results:
+        Path(BENCHMARK_OUTPUT).write_text(
+            json.dumps(
+                {"python": platform.python_version(), "results": results}, indent=2
+            )
+            + "\n"
+        )
+
+
+def switch_pages(ports: int) -> dict[str, str]:
+    """Return the web interface pages of a switch with the given number of ports."""
+    return MercurySwitchSimulator(SimulatorConfig(ports=ports)).render_pages()
@@ -0,0 +1,154 @@
+"""Benchmark the setup and update fan-out of fleets of Mercury switches."""
+
+import statistics
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mercury_switch.const import DOMAIN
+
+from .conftest import switch_pages
+
+FLEETS = [(ports, entries) for ports in (8, 24, 48) for entries in (1, 10, 50)] + [
+    (8, 200)
+]
+# coordinator updates timed per fleet
+FANOUT_ROUNDS = 5
+
+
+@pytest.fixture
+def mock_switch_pages(ports: int) -> dict[str, str]:
+    """Mock web interface pages of a switch with `ports` ports."""
+    return switch_pages(ports)
+
+
+def fleet_entries(entries: int) -> list[MockConfigEntry]:
+    """Return the config entries of a fleet of switches, all served by the mock."""
+    return [
+        MockConfigEntry(
+            version=1,
+            domain=DOMAIN,
+            title=f"Switch {index}",
+            data={
+                CONF_HOST: "192.168.1.100",
+                CONF_USERNAME: "admin",
+                CONF_PASSWORD: "test",
+            },
+            unique_id=f"sg108pro_benchmark_{index}",
+        )
+        for index in range(entries)
+    ]
+
+
+async def async_setup_fleet(
+    hass: HomeAssistant, fleet: list[MockConfigEntry]
+) -> list[float]:
+    """Set up the entries of a fleet one by one, return the seconds of each."""
+    durations = []
+    for entry in fleet:
+        # added one by one, setting up the integration sets up all added entries
+        entry.add_to_hass(hass)
+        start = time.perf_counter()
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        durations.append(time.perf_counter() - start)
+        assert entry.state is ConfigEntryState.LOADED
+    return durations
+
+
+def fleet_entities(hass: HomeAssistant, fleet: list[MockConfigEntry]) -> int:
+    """Return the number of entities created for a fleet."""
+    entity_registry = er.async_get(hass)
+    return sum(
+        len(er.async_entries_for_config_entry(entity_registry, entry.entry_id))
+        for entry in fleet
+    )
+
+
+def fanout_seconds(fleet: list[MockConfigEntry], infos: dict[str, Any]) -> float:
+    """Return the median seconds to notify the port entities of a switch."""
+    durations = []
+    for _ in range(FANOUT_ROUNDS):
+        for entry in fleet:
+            coordinator = entry.runtime_data.coordinator_port_infos
+            if infos:
+                coordinator.data.update(infos)
+            start = time.perf_counter()
+            coordinator.async_update_listeners()
+            durations.append(time.perf_counter() - start)
+        infos = {key: value + 1 for key, value in infos.items()}
+    return statistics.median(durations)
+
+
+@pytest.mark.parametrize(("ports", "entries"), FLEETS)
+async def test_fleet_setup_and_fanout(
+    hass: HomeAssistant,
+    mock_mercury_switch_api: MagicMock,
+    benchmark_results: list[dict[str, Any]],
+    ports: int,
+    entries: int,
+) -> None:
+    """Time the setup of a fleet and the fan-out of its coordinator updates."""
+    mock_mercury_switch_api.ports = ports
+    fleet = fleet_entries(entries)
+
+    setup_durations = await async_setup_fleet(hass, fleet)
+    entities = fleet_entities(hass, fleet)
+    # unchanged data skips the state writes, changed counters write every port
+    counters = {f"port_{port}_tx_good": 10**6 for port in range(1, ports + 1)}
+
+    benchmark_results.append(
+        {
+            "benchmark": "setup_and_fanout",
+            "ports": ports,
+            "entries": entries,
+            "entities": entities,
+            "entities_per_entry": entities / entries,
+            "setup_seconds": sum(setup_durations),
+            "setup_seconds_per_entry": statistics.median(setup_durations),
+            "fanout_unchanged_seconds": fanout_seconds(fleet, {}),
+            "fanout_changed_seconds": fanout_seconds(fleet, counters),
+        }
+    )
+
+
+@pytest.mark.parametrize(("ports", "entries"), [(8, 10), (24, 10), (48, 10)])
+async def test_fleet_memory(
+    hass: HomeAssistant,
+    mock_mercury_switch_api: MagicMock,
+    benchmark_results: list[dict[str, Any]],
+    ports: int,
+    entries: int,
+) -> None:
+    """Measure the memory allocated per entity by the setup of a fleet."""
+    mock_mercury_switch_api.ports = ports
+    fleet = fleet_entries(entries)
+
+    tracemalloc.start()
+    try:
+        before, _peak = tracemalloc.get_traced_memory()
+        await async_setup_fleet(hass, fleet)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    entities = fleet_entities(hass, fleet)
+
+    benchmark_results.append(
+        {
+            "benchmark": "memory",
+            "ports": ports,
+            "entries": entries,
+            "entities": entities,
+            "memory_bytes": after - before,
+            "memory_peak_bytes": peak - before,
+            "memory_bytes_per_entity": (after - before) / entities,
+        }
+    )
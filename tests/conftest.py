@@ -5,6 +5,8 @@ from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
+from py_mercury_switch_api.fetcher import BaseResponse
+from py_mercury_switch_api.models import SG108Pro
 
 # Enable custom component loading
 pytest_plugins = "pytest_homeassistant_custom_component"
@@ -17,42 +19,84 @@ def auto_enable_custom_integrations(enable_custom_integrations):
 
 
 @pytest.fixture
-def mock_mercury_switch_api() -> Iterator[MagicMock]:
-    """Create a mocked MercurySwitchConnector."""
+def mock_switch_pages() -> dict[str, str]:
+    """Mock web interface pages of an 8-port switch, keyed by url path."""
+    return {
+        "/SystemInfoRpm.htm": """<script>
+var info_ds = {
+descriStr:["SG108-Pro"],
+macStr:["00:AA:BB:CC:DD:EE"],
+ipStr:["192.168.1.100"],
+firmwareStr:["1.0.0 Build 20180515 Rel.60767"],
+hardwareStr:["SG108 Pro 1.0"]
+};
+</script>""",
+        "/PortSettingRpm.htm": """<script>
+var max_port_num = 8;
+var all_info = {
+state:[1,1,1,1,1,1,1,1],
+spd_act:[6,0,0,0,0,0,0,0]
+};
+</script>""",
+        "/PortStatisticsRpm.htm": """<script>
+var max_port_num = 8;
+var all_info = {
+state:[1,1,1,1,1,1,1,1],
+link_status:[6,0,0,0,0,0,0,0],
+pkts:[1000,0,2000,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]
+};
+</script>""",
+        "/Vlan8021QRpm.htm": """<script>
+var qvlan_ds = {
+state:1,
+portNum:8,
+count:2,
+vids:[1,10],
+names:["Default","VLAN10"],
+tagMbrs:[0,65],
+untagMbrs:[255,0]
+};
+</script>""",
+    }
+
+
+@pytest.fixture
+def mock_page_fetcher(mock_switch_pages: dict[str, str]) -> Iterator[MagicMock]:
+    """Create a mocked KeepAlivePageFetcher serving `mock_switch_pages`."""
+
+    def request(
+        method: str, url: str, data: dict[str, Any] | None = None
+    ) -> BaseResponse:
+        path = url.removeprefix("http://192.168.1.100")
+        response = BaseResponse()
+        if path in mock_switch_pages:
+            response.status_code = 200
+            response.text = mock_switch_pages[path]
+        return response
+
+    with patch("custom_components.mercury_switch.session.KeepAlivePageFetcher") as mock:
+        fetcher = MagicMock()
+        fetcher.request = MagicMock(side_effect=request)
+        fetcher.has_ok_status = MagicMock(
+            side_effect=lambda response: response.status_code == 200
+        )
+        mock.return_value = fetcher
+        yield fetcher
+
+
+@pytest.fixture
+def mock_mercury_switch_api(mock_page_fetcher: MagicMock) -> Iterator[MagicMock]:
+    """Create a mocked MercurySwitchConnector serving `mock_switch_pages`."""
     with patch(
         "custom_components.mercury_switch.mercury_switch.MercurySwitchConnector"
     ) as mock:
         connector = MagicMock()
+        connector.host = "192.168.1.100"
         connector.get_login_cookie = MagicMock(return_value=True)
         connector.autodetect_model = MagicMock()
         connector.get_unique_id = MagicMock(return_value="sg108pro_192_168_1_100")
-        connector.get_switch_infos = MagicMock(
-            return_value={
-                "switch_model": "SG108-Pro",
-                "switch_mac": "00:AA:BB:CC:DD:EE",
-                "switch_ip": "192.168.1.100",
-                "switch_firmware": "1.0.0 Build 20180515 Rel.60767",
-                "switch_hardware": "SG108 Pro 1.0",
-                "port_1_status": "on",
-                "port_1_connection_speed": "1000M全双工",
-                "port_1_tx_good": 1000,
-                "port_1_rx_good": 2000,
-                "port_2_status": "off",
-                "port_2_connection_speed": "断开",
-                "port_2_tx_good": 0,
-                "port_2_rx_good": 0,
-                "vlan_enabled": True,
-                "vlan_type": "802.1Q",
-                "vlan_count": 7,
-                "vlan_1_name": "Default",
-                "vlan_10_name": "VLAN10",
-                "vlan_10_tagged_ports": "1, 7",
-                "vlan_10_untagged_ports": "",
-            }
-        )
         connector.ports = 8
-        connector.switch_model = MagicMock()
-        connector.switch_model.MODEL_NAME = "SG108Pro"
+        connector.switch_model = SG108Pro
         mock.return_value = connector
         yield connector
 
@@ -0,0 +1,335 @@
+"""
+Simulator of the web interface of Mercury switches.
+
+Serves the pages the connector scrapes over real HTTP, with configurable port
+count, VLANs, response latency, session expiry and injected errors, so the
+login, fetch and parse path of the integration can be load tested end to end
+without hardware.
+
+Run `python -m tests.simulator --help` from the repository root, or
+`scripts/simulate`, to start simulated switches for a development instance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import secrets
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+COOKIE_NAME = "Authorization"
+# link_status value of a 1000M full duplex link, 0 is link down
+LINK_UP = 6
+LINK_DOWN = 0
+# spd_act value of an auto-negotiated port
+SPEED_AUTO = 0
+
+# pages served without login, the model is detected before logging in
+PUBLIC_PAGES = {"/SystemInfoRpm.htm"}
+
+LOGON_PAGE = """<html><script>
+var logonInfo = new Array({err_type}, 0, 0);
+</script></html>"""
+
+
+@dataclass
+class SimulatedVlan:
+    """802.1Q VLAN of a simulated switch."""
+
+    vid: int
+    name: str
+    tagged_ports: list[int] = field(default_factory=list)
+    untagged_ports: list[int] = field(default_factory=list)
+
+
+@dataclass
+class SimulatorConfig:
+    """Behavior of a simulated switch."""
+
+    ports: int = 8
+    model: str = "SG108-Pro"
+    username: str = "admin"
+    password: str = "admin"  # noqa: S105
+    # VLANs, by default one VLAN with all ports untagged
+    vlans: list[SimulatedVlan] | None = None
+    # ports without link
+    down_ports: set[int] = field(default_factory=set)
+    # seconds added to every response, plus a random jitter up to `jitter`
+    latency: float = 0.0
+    jitter: float = 0.0
+    # seconds a login stays valid, None keeps sessions forever
+    session_timeout: float | None = None
+    # share of page requests answered with HTTP 500
+    error_rate: float = 0.0
+    # share of page requests left unanswered for `hang_seconds`
+    hang_rate: float = 0.0
+    hang_seconds: float = 60.0
+    # packets per second counted on every linked port
+    packets_per_second: float = 100.0
+    seed: int | None = None
+
+
+class MercurySwitchSimulator:
+    """HTTP server mimicking the web interface of a Mercury switch."""
+
+    def __init__(self, config: SimulatorConfig | None = None) -> None:
+        """Initialize the simulator."""
+        self.config = config or SimulatorConfig()
+        if self.config.vlans is None:
+            self.config.vlans = [
+                SimulatedVlan(1, "Default", [], list(range(1, self.config.ports + 1)))
+            ]
+        self._random = random.Random(self.config.seed)  # noqa: S311
+        self._sessions: dict[str, float] = {}
+        self._started_at = time.monotonic()
+        self._runner: web.AppRunner | None = None
+        self.host: str | None = None
+
+        # request statistics
+        self.logins = 0
+        self.failed_logins = 0
+        self.expired_requests = 0
+        self.page_requests = 0
+        self.injected_errors = 0
+        self.injected_hangs = 0
+
+        self.app = web.Application()
+        self.app.router.add_post("/logon.cgi", self._handle_logon)
+        for path, render in self._pages().items():
+            self.app.router.add_get(path, self._page_handler(path, render))
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving, return the host:port to configure the integration with."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        address = self._runner.addresses[0]
+        self.host = f"{address[0]}:{address[1]}"
+        _LOGGER.info("Simulated %s listening on %s", self.config.model, self.host)
+        return self.host
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def expire_sessions(self) -> None:
+        """End all login sessions, as a switch reboot or timeout would."""
+        self._sessions.clear()
+
+    def set_link(self, port: int, *, up: bool) -> None:
+        """Plug or unplug the cable of a port."""
+        if up:
+            self.config.down_ports.discard(port)
+        else:
+            self.config.down_ports.add(port)
+
+    def render_pages(self) -> dict[str, str]:
+        """Return the current pages, keyed by url path."""
+        return {path: render() for path, render in self._pages().items()}
+
+    def _pages(self) -> dict[str, Callable[[], str]]:
+        """Return the page renderers, keyed by url path."""
+        return {
+            "/SystemInfoRpm.htm": self._system_info_page,
+            "/PortSettingRpm.htm": self._port_setting_page,
+            "/PortStatisticsRpm.htm": self._port_statistics_page,
+            "/Vlan8021QRpm.htm": self._vlan_page,
+        }
+
+    async def _delay(self) -> None:
+        """Wait the configured latency."""
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def _handle_logon(self, request: web.Request) -> web.Response:
+        """Check the credentials and start a session."""
+        await self._delay()
+        form = await request.post()
+        if (form.get("username"), form.get("password")) != (
+            self.config.username,
+            self.config.password,
+        ):
+            self.failed_logins += 1
+            return web.Response(
+                text=LOGON_PAGE.format(err_type=1), content_type="text/html"
+            )
+        self.logins += 1
+        token = secrets.token_hex(8)
+        self._sessions[token] = time.monotonic()
+        response = web.Response(
+            text=LOGON_PAGE.format(err_type=0), content_type="text/html"
+        )
+        response.set_cookie(COOKIE_NAME, token)
+        return response
+
+    def _logged_in(self, request: web.Request) -> bool:
+        """Return True if the request carries a valid session cookie."""
+        token = request.cookies.get(COOKIE_NAME)
+        logged_in_at = self._sessions.get(token) if token else None
+        if logged_in_at is None:
+            return False
+        timeout = self.config.session_timeout
+        if timeout is not None and time.monotonic() - logged_in_at > timeout:
+            del self._sessions[token]
+            return False
+        return True
+
+    def _page_handler(
+        self, path: str, render: Callable[[], str]
+    ) -> Callable[[web.Request], Awaitable[web.Response]]:
+        """Return the request handler of a page."""
+
+        async def handle(request: web.Request) -> web.Response:
+            self.page_requests += 1
+            await self._delay()
+            if path not in PUBLIC_PAGES and not self._logged_in(request):
+                # expired sessions get the login page, as the switch does
+                self.expired_requests += 1
+                return web.Response(
+                    text=LOGON_PAGE.format(err_type=5), content_type="text/html"
+                )
+            draw = self._random.random()
+            if draw < self.config.hang_rate:
+                self.injected_hangs += 1
+                await asyncio.sleep(self.config.hang_seconds)
+            elif draw < self.config.hang_rate + self.config.error_rate:
+                self.injected_errors += 1
+                return web.Response(status=500, text="Internal Server Error")
+            return web.Response(text=render(), content_type="text/html")
+
+        return handle
+
+    def _system_info_page(self) -> str:
+        """Render SystemInfoRpm.htm."""
+        return f"""<script>
+var info_ds = {{
+descriStr:["{self.config.model}"],
+macStr:["00:AA:BB:CC:DD:EE"],
+ipStr:["192.168.1.100"],
+firmwareStr:["1.0.0 Build 20180515 Rel.60767"],
+hardwareStr:["{self.config.model} 1.0"]
+}};
+</script>"""
+
+    def _link_status(self) -> list[int]:
+        """Return the link status of every port."""
+        return [
+            LINK_DOWN if port in self.config.down_ports else LINK_UP
+            for port in range(1, self.config.ports + 1)
+        ]
+
+    def _port_setting_page(self) -> str:
+        """Render PortSettingRpm.htm."""
+        ports = self.config.ports
+        return f"""<script>
+var max_port_num = {ports};
+var all_info = {{
+state:[{",".join(["1"] * ports)}],
+spd_act:[{",".join([str(SPEED_AUTO)] * ports)}]
+}};
+</script>"""
+
+    def _port_statistics_page(self) -> str:
+        """Render PortStatisticsRpm.htm, counters grow with the uptime."""
+        ports = self.config.ports
+        link_status = self._link_status()
+        packets = int(
+            (time.monotonic() - self._started_at) * self.config.packets_per_second
+        )
+        pkts: list[int] = []
+        for status in link_status:
+            count = packets if status else 0
+            pkts.extend((count, 0, 2 * count, 0))
+        return f"""<script>
+var max_port_num = {ports};
+var all_info = {{
+state:[{",".join(["1"] * ports)}],
+link_status:[{",".join(map(str, link_status))}],
+pkts:[{",".join(map(str, pkts))}]
+}};
+</script>"""
+
+    def _vlan_page(self) -> str:
+        """Render Vlan8021QRpm.htm."""
+        vlans = self.config.vlans or []
+
+        def members(ports: list[int]) -> str:
+            return str(sum(1 << (port - 1) for port in ports))
+
+        return f"""<script>
+var qvlan_ds = {{
+state:1,
+portNum:{self.config.ports},
+count:{len(vlans)},
+vids:[{",".join(str(vlan.vid) for vlan in vlans)}],
+names:[{",".join(f'"{vlan.name}"' for vlan in vlans)}],
+tagMbrs:[{",".join(members(vlan.tagged_ports) for vlan in vlans)}],
+untagMbrs:[{",".join(members(vlan.untagged_ports) for vlan in vlans)}]
+}};
+</script>"""
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Run simulated switches on consecutive ports until interrupted."""
+    simulators = []
+    for index in range(args.switches):
+        simulator = MercurySwitchSimulator(
+            SimulatorConfig(
+                ports=args.ports,
+                username=args.username,
+                password=args.password,
+                latency=args.latency,
+                jitter=args.jitter,
+                session_timeout=args.session_timeout,
+                error_rate=args.error_rate,
+                hang_rate=args.hang_rate,
+            )
+        )
+        await simulator.async_start(args.bind, args.port + index if args.port else 0)
+        _LOGGER.warning("Simulated switch %d: host %s", index + 1, simulator.host)
+        simulators.append(simulator)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for simulator in simulators:
+            await simulator.async_stop()
+
+
+def main() -> None:
+    """Parse the command line and run the simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--switches", type=int, default=1, help="switches to run")
+    parser.add_argument("--ports", type=int, default=8, help="ports per switch")
+    parser.add_argument("--bind", default="127.0.0.1", help="address to listen on")
+    parser.add_argument(
+        "--port", type=int, default=8080, help="port of the first switch, 0 for any"
+    )
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument(
+        "--session-timeout", type=float, default=None, help="seconds, default never"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0 to 1")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="0 to 1")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
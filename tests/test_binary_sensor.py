@@ -10,6 +10,7 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.mercury_switch.binary_sensor import async_setup_entry
 from custom_components.mercury_switch.const import DOMAIN
+from custom_components.mercury_switch.snapshot import SwitchSnapshot
 
 
 @pytest.fixture
@@ -71,7 +72,7 @@ async def test_binary_sensor_entities_created(
         update_method=AsyncMock(return_value=mock_switch_infos),
         config_entry=mock_config_entry,
     )
-    coordinator.data = mock_switch_infos
+    coordinator.data = SwitchSnapshot.from_switch_infos(mock_switch_infos)
 
     mock_config_entry.runtime_data = MercurySwitchData(switch, coordinator)
 
@@ -125,7 +126,7 @@ async def test_binary_sensor_values(
         update_method=AsyncMock(return_value=mock_switch_infos),
         config_entry=mock_config_entry,
     )
-    coordinator.data = mock_switch_infos
+    coordinator.data = SwitchSnapshot.from_switch_infos(mock_switch_infos)
 
     mock_config_entry.runtime_data = MercurySwitchData(switch, coordinator)
 
@@ -0,0 +1,67 @@
+"""Test the circuit breaker of the Mercury Switch integration."""
+
+from unittest.mock import MagicMock, patch
+
+from custom_components.mercury_switch.circuit_breaker import CircuitBreaker
+from custom_components.mercury_switch.const import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+)
+
+
+def test_circuit_breaker_opens_after_threshold() -> None:
+    """Test that consecutive failures open the breaker until the cooldown is over."""
+    with patch(
+        "custom_components.mercury_switch.circuit_breaker.time.monotonic"
+    ) as monotonic:
+        monotonic.return_value = 100.0
+        breaker = CircuitBreaker(threshold=3, cooldown=60.0)
+
+        breaker.record_failure()
+        breaker.record_failure()
+        # a success resets the consecutive failures
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_CLOSED
+        assert breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_OPEN
+        assert breaker.trips == 1
+        assert not breaker.allow()
+        assert breaker.retry_in == 60.0
+
+        monotonic.return_value = 130.0
+        assert not breaker.allow()
+        assert breaker.retry_in == 30.0
+
+
+def test_circuit_breaker_half_open_trial() -> None:
+    """Test that only one trial poll runs after the cooldown, closing or reopening."""
+    monotonic = MagicMock(return_value=100.0)
+    with patch(
+        "custom_components.mercury_switch.circuit_breaker.time.monotonic", monotonic
+    ):
+        breaker = CircuitBreaker(threshold=1, cooldown=60.0)
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_OPEN
+
+        monotonic.return_value = 160.0
+        assert breaker.state == CIRCUIT_HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        # a failed trial reopens the breaker for another cooldown
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_OPEN
+        assert breaker.trips == 1
+        assert breaker.retry_in == 60.0
+
+        monotonic.return_value = 220.0
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CIRCUIT_CLOSED
+        assert breaker.failures == 0
+        assert breaker.allow()
@@ -1,11 +1,23 @@
 """Test config flow for Mercury Switch integration."""
 
+import time
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
+from py_mercury_switch_api.models import MercurySwitchModelNotDetectedError
 
-from custom_components.mercury_switch.const import DOMAIN
+from custom_components.mercury_switch.const import (
+    CONF_MODEL,
+    CONF_PORTS,
+    DOMAIN,
+    KEY_PROBES,
+)
 
 
 async def test_config_flow_success(
@@ -32,6 +44,8 @@ async def test_config_flow_success(
     assert result["data"][CONF_HOST] == "192.168.1.100"
     assert result["data"][CONF_USERNAME] == "admin"
     assert result["data"][CONF_PASSWORD] == "test123"
+    assert result["data"][CONF_MODEL] == "SG108Pro"
+    assert result["data"][CONF_PORTS] == 8
 
 
 async def test_config_flow_auth_failure(
@@ -108,3 +122,96 @@ async def test_config_flow_duplicate(
 
     assert result["type"] is FlowResultType.ABORT
     assert result["reason"] == "already_configured"
+
+
+async def test_config_flow_session_reused_by_setup(
+    hass: HomeAssistant, mock_mercury_switch_api
+) -> None:
+    """Test that the entry setup reuses the session validated by the flow."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_HOST: "192.168.1.100",
+            CONF_USERNAME: "admin",
+            CONF_PASSWORD: "test",
+        },
+    )
+    await hass.async_block_till_done()
+
+    entry = result["result"]
+    assert entry.state is config_entries.ConfigEntryState.LOADED
+    # one login and one model detection for both the flow and the setup
+    assert mock_mercury_switch_api.get_login_cookie.call_count == 1
+    mock_mercury_switch_api.autodetect_model.assert_called_once()
+    assert entry.runtime_data.switch.session.login_count == 1
+    assert not hass.data[DOMAIN][KEY_PROBES]
+
+
+async def test_config_flow_model_not_detected(
+    hass: HomeAssistant, mock_mercury_switch_api: MagicMock
+) -> None:
+    """Test that a switch whose model cannot be detected cannot be connected."""
+    mock_mercury_switch_api.switch_model = MagicMock(MODEL_NAME="")
+    mock_mercury_switch_api.get_unique_id.side_effect = (
+        MercurySwitchModelNotDetectedError
+    )
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_HOST: "192.168.1.100",
+            CONF_USERNAME: "admin",
+            CONF_PASSWORD: "test",
+        },
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"]["base"] == "cannot_connect"
+
+
+async def test_config_flow_timeout_closes_late_session(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that a login finishing after the flow timed out is closed."""
+    session = MagicMock()
+
+    def slow_get_session(*_args: Any) -> MagicMock:
+        time.sleep(0.2)
+        return session
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    with (
+        patch(
+            "custom_components.mercury_switch.config_flow.get_session",
+            slow_get_session,
+        ),
+        patch(
+            "custom_components.mercury_switch.config_flow.DEFAULT_CONF_TIMEOUT",
+            timedelta(seconds=0.02),
+        ),
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                CONF_HOST: "192.168.1.100",
+                CONF_USERNAME: "admin",
+                CONF_PASSWORD: "test",
+            },
+        )
+
+        assert result["type"] is FlowResultType.FORM
+        assert result["errors"]["base"] == "cannot_connect"
+        assert "Timed out connecting to 192.168.1.100" in caplog.text
+        assert "Traceback" not in caplog.text
+        session.close.assert_not_called()
+
+        await hass.async_block_till_done(wait_background_tasks=True)
+        session.close.assert_called_once()
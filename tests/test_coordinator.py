@@ -0,0 +1,90 @@
+"""Test update coordinators for Mercury Switch integration."""
+
+from datetime import timedelta
+
+from custom_components.mercury_switch.coordinator import (
+    BOOST_POLLS,
+    IDLE_MAX_RATE,
+    AdaptiveScanInterval,
+)
+from custom_components.mercury_switch.snapshot import SwitchSnapshot
+
+BASE = timedelta(seconds=30)
+MINIMUM = timedelta(seconds=10)
+MAXIMUM = timedelta(minutes=5)
+
+
+def test_adaptive_interval_backs_off_when_unchanged() -> None:
+    """Test that unchanged polls back off up to the maximum."""
+    interval = AdaptiveScanInterval(BASE, MINIMUM, MAXIMUM)
+    data = {"port_1_status": "on", "port_1_tx_good": 10}
+    snapshot = SwitchSnapshot()
+
+    assert interval.after_update(snapshot.update(data), snapshot) == BASE
+    assert interval.after_update(snapshot.update(data), snapshot) == timedelta(
+        seconds=60
+    )
+    for _ in range(10):
+        interval.after_update(snapshot.update(data), snapshot)
+    assert interval.current == MAXIMUM
+
+    change = snapshot.update({**data, "port_1_connection_speed": "100M Full"})
+    assert interval.after_update(change, snapshot) == BASE
+
+
+def test_adaptive_interval_backs_off_with_background_traffic() -> None:
+    """Test that slowly rising counters still count as an idle switch."""
+    interval = AdaptiveScanInterval(BASE, MINIMUM, MAXIMUM)
+    snapshot = SwitchSnapshot()
+    data = {"port_1_status": "on", "port_1_connection_speed": "1000M Full"}
+
+    interval.after_update(snapshot.update(data), snapshot)
+    for poll in range(1, 11):
+        # a few broadcast packets per second
+        change = snapshot.update(
+            {
+                **data,
+                "port_1_tx_good": 100 * poll,
+                "port_1_rx_good": 150 * poll,
+                "port_1_tx_rate": 2.0,
+                "port_1_rx_rate": 3.0 + poll % 2,
+            }
+        )
+        assert change.changed
+        interval.after_update(change, snapshot)
+    assert interval.current == MAXIMUM
+
+    # real traffic polls at the base interval again
+    change = snapshot.update({**data, "port_1_tx_rate": IDLE_MAX_RATE + 1})
+    assert interval.after_update(change, snapshot) == BASE
+
+
+def test_adaptive_interval_backs_off_when_unreachable() -> None:
+    """Test that failed polls back off."""
+    interval = AdaptiveScanInterval(BASE, MINIMUM, MAXIMUM)
+
+    assert interval.after_failure() == timedelta(seconds=60)
+    assert interval.after_failure() == timedelta(seconds=120)
+
+
+def test_adaptive_interval_tightens_after_link_change() -> None:
+    """Test that a port link transition polls at the minimum for a while."""
+    interval = AdaptiveScanInterval(BASE, MINIMUM, MAXIMUM)
+    snapshot = SwitchSnapshot()
+    link_down = {"port_1_status": "off"}
+
+    interval.after_update(snapshot.update({"port_1_status": "on"}), snapshot)
+    assert interval.after_update(snapshot.update(link_down), snapshot) == MINIMUM
+    for _ in range(BOOST_POLLS - 1):
+        assert interval.after_update(snapshot.update(link_down), snapshot) == MINIMUM
+    assert interval.after_update(snapshot.update(link_down), snapshot) == BASE * 2
+
+
+def test_adaptive_interval_tightens_after_traffic_burst() -> None:
+    """Test that a jump of the packet rates polls at the minimum."""
+    interval = AdaptiveScanInterval(BASE, MINIMUM, MAXIMUM)
+    snapshot = SwitchSnapshot()
+
+    interval.after_update(snapshot.update({"port_1_tx_rate": 10.0}), snapshot)
+    change = snapshot.update({"port_1_tx_rate": 5000.0})
+    assert interval.after_update(change, snapshot) == MINIMUM
@@ -0,0 +1,183 @@
+"""Test the Mercury Switch counter statistics."""
+
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.statistics import get_last_statistics
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.mercury_switch.const import CONF_COUNTER_STATISTICS, DOMAIN
+from custom_components.mercury_switch.counter_statistics import (
+    CounterSeries,
+    CounterStatistics,
+)
+
+HOUR = datetime(2025, 1, 1, 10, tzinfo=UTC)
+STATISTIC_ID = "mercury_switch:sg108pro_192_168_1_100_port_1_tx_good"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Recorder,
+    enable_custom_integrations: None,
+) -> None:
+    """Enable custom integrations, after the recorder the tests need."""
+    del recorder_mock, enable_custom_integrations
+
+
+def test_series_sums_hours() -> None:
+    """Test that completed hours carry the counter increase, across resets."""
+    series = CounterSeries(MagicMock())
+    series.add(100, HOUR)
+    series.add(150, HOUR)
+    assert series.hours == []
+
+    series.add(170, HOUR + timedelta(hours=1))
+    assert series.hours == [(HOUR, 150, 50)]
+
+    # the switch rebooted, its counters restarted from zero
+    series.add(30, HOUR + timedelta(hours=2))
+    assert series.hours == [(HOUR, 150, 50), (HOUR + timedelta(hours=1), 170, 70)]
+    assert series.increase == 100
+
+
+async def _async_last_statistic(hass: HomeAssistant) -> dict:
+    """Return the last imported statistic of port 1 TX."""
+    await async_wait_recording_done(hass)
+    rows = await get_instance(hass).async_add_executor_job(
+        partial(
+            get_last_statistics,
+            hass,
+            1,
+            STATISTIC_ID,
+            convert_units=True,
+            types={"state", "sum"},
+        )
+    )
+    return rows[STATISTIC_ID][0]
+
+
+async def test_statistics_imported(hass: HomeAssistant) -> None:
+    """Test that hourly sums are imported and continued after a restart."""
+    statistics = CounterStatistics(hass, "sg108pro_192_168_1_100", "SG108Pro")
+    assert statistics.statistic_id(1, "tx_good") == STATISTIC_ID
+
+    assert not statistics.update({"port_1_tx_good": 1000}, 1, HOUR)
+    assert not statistics.update({"port_1_tx_good": 1500}, 1, HOUR)
+    assert statistics.update({"port_1_tx_good": 1600}, 1, HOUR + timedelta(hours=1))
+    await statistics.async_import()
+
+    row = await _async_last_statistic(hass)
+    assert row["start"] == HOUR.timestamp()
+    assert row["state"] == 1500
+    assert row["sum"] == 500
+
+    # a restart loses the series, the growth meanwhile is still counted
+    statistics = CounterStatistics(hass, "sg108pro_192_168_1_100", "SG108Pro")
+    statistics.update({"port_1_tx_good": 2000}, 1, HOUR + timedelta(hours=2))
+    statistics.update({"port_1_tx_good": 2100}, 1, HOUR + timedelta(hours=2))
+    await statistics.async_import(flush=True)
+
+    row = await _async_last_statistic(hass)
+    assert row["start"] == (HOUR + timedelta(hours=2)).timestamp()
+    assert row["state"] == 2100
+    assert row["sum"] == 1100
+
+
+async def test_counter_sensors_replaced(
+    hass: HomeAssistant, mock_mercury_switch_api: MagicMock
+) -> None:
+    """Test that the counter sensors are disabled while statistics replace them."""
+    del mock_mercury_switch_api
+    entry = MockConfigEntry(
+        version=1,
+        domain=DOMAIN,
+        title="SG108Pro (192.168.1.100)",
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_USERNAME: "admin",
+            CONF_PASSWORD: "test",
+        },
+        unique_id="sg108pro_192_168_1_100",
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_registry = er.async_get(hass)
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, "sg108pro_192_168_1_100-port_1_tx_good-0"
+    )
+    entity_registry.async_update_entity(entity_id, name="Uplink TX")
+    user_disabled = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, "sg108pro_192_168_1_100-port_2_tx_good-0"
+    )
+    entity_registry.async_update_entity(
+        user_disabled, disabled_by=er.RegistryEntryDisabler.USER
+    )
+
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_COUNTER_STATISTICS: True}
+    )
+    await hass.async_block_till_done()
+
+    assert entry.runtime_data.switch.counter_statistics is not None
+    assert hass.states.get(entity_id) is None
+    registry_entry = entity_registry.async_get(entity_id)
+    assert registry_entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert registry_entry.name == "Uplink TX"
+    assert entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, "sg108pro_192_168_1_100-port_1_speed-0"
+    )
+
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_COUNTER_STATISTICS: False}
+    )
+    await hass.async_block_till_done()
+
+    assert entry.runtime_data.switch.counter_statistics is None
+    registry_entry = entity_registry.async_get(entity_id)
+    assert registry_entry.disabled_by is None
+    assert registry_entry.name == "Uplink TX"
+    assert hass.states.get(entity_id) is not None
+    assert (
+        entity_registry.async_get(user_disabled).disabled_by
+        is er.RegistryEntryDisabler.USER
+    )
+
+
+async def test_hour_completed_during_import_kept(hass: HomeAssistant) -> None:
+    """Test that an hour completed while the first import runs is imported later."""
+    statistics = CounterStatistics(hass, "sg108pro_192_168_1_100", "SG108Pro")
+    statistics.update({"port_1_tx_good": 1000}, 1, HOUR)
+    statistics.update({"port_1_tx_good": 1600}, 1, HOUR + timedelta(hours=1))
+
+    def last_statistics_during_poll(*args: Any, **kwargs: Any) -> dict:
+        # a poll completes another hour while the base sum is read
+        statistics.update({"port_1_tx_good": 1700}, 1, HOUR + timedelta(hours=2))
+        return get_last_statistics(*args, **kwargs)
+
+    with patch(
+        "custom_components.mercury_switch.counter_statistics.get_last_statistics",
+        last_statistics_during_poll,
+    ):
+        await statistics.async_import()
+
+    # the hour the poll completed is still pending and imported next time
+    assert statistics.update({"port_1_tx_good": 1700}, 1, HOUR + timedelta(hours=2))
+    await statistics.async_import()
+
+    row = await _async_last_statistic(hass)
+    assert row["start"] == (HOUR + timedelta(hours=1)).timestamp()
+    assert row["state"] == 1600
+    assert row["sum"] == 600
@@ -0,0 +1,118 @@
+"""Test the port events of the Mercury Switch integration."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.mercury_switch.const import DOMAIN, EVENT_PORT
+from custom_components.mercury_switch.port_events import PortEvents
+from custom_components.mercury_switch.snapshot import SwitchSnapshot
+
+COOLDOWN = timedelta(seconds=11)
+
+
+@pytest.fixture
+def mock_config_entry() -> MockConfigEntry:
+    """Create a mock config entry."""
+    return MockConfigEntry(
+        version=1,
+        domain=DOMAIN,
+        title="SG108Pro (192.168.1.100)",
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_USERNAME: "admin",
+            CONF_PASSWORD: "test",
+        },
+        unique_id="sg108pro_192_168_1_100",
+        entry_id="test_entry_id",
+    )
+
+
+async def test_transitions_debounced(hass: HomeAssistant) -> None:
+    """Test that the transitions of a window are merged into one event per port."""
+    events = async_capture_events(hass, EVENT_PORT)
+    port_events = PortEvents(hass, "test_entry_id")
+    snapshot = SwitchSnapshot.from_switch_infos(
+        {
+            "port_1_status": "on",
+            "port_1_connection_speed": "1000M Full Duplex",
+            "port_2_status": "on",
+            "port_2_connection_speed": "100M Full Duplex",
+        }
+    )
+
+    for switch_infos in (
+        {"port_1_status": "off", "port_1_connection_speed": "Disconnected"},
+        {"port_1_status": "on", "port_1_connection_speed": "100M Full Duplex"},
+        {"port_2_status": "off", "port_2_connection_speed": "Disconnected"},
+    ):
+        port_events.async_add_transitions(snapshot.update(switch_infos), snapshot.ports)
+    await hass.async_block_till_done()
+    assert events == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + COOLDOWN)
+    await hass.async_block_till_done()
+
+    assert [event.data for event in events] == [
+        {
+            "config_entry_id": "test_entry_id",
+            "type": "flap",
+            "port": 1,
+            "old_speed": "1000M Full Duplex",
+            "new_speed": "100M Full Duplex",
+            "flaps": 2,
+        },
+        {
+            "config_entry_id": "test_entry_id",
+            "type": "link_down",
+            "port": 2,
+            "old_speed": "100M Full Duplex",
+            "new_speed": "Disconnected",
+            "flaps": 1,
+        },
+    ]
+    port_events.async_shutdown()
+
+
+async def test_port_event_entity(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_switch_pages: dict[str, str],
+) -> None:
+    """Test that a port going down triggers the port events entity."""
+    del mock_mercury_switch_api
+    events = async_capture_events(hass, EVENT_PORT)
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "event", DOMAIN, "sg108pro_192_168_1_100-port_events-0"
+    )
+    assert entity_id is not None
+    assert hass.states.get(entity_id).state == "unknown"
+
+    mock_switch_pages["/PortStatisticsRpm.htm"] = mock_switch_pages[
+        "/PortStatisticsRpm.htm"
+    ].replace("link_status:[6,", "link_status:[0,")
+    await mock_config_entry.runtime_data.coordinator_port_infos.async_refresh()
+    async_fire_time_changed(hass, dt_util.utcnow() + COOLDOWN)
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    state = hass.states.get(entity_id)
+    assert state.attributes["event_type"] == "link_down"
+    assert state.attributes["port"] == 1
+    assert state.attributes["old_speed"] == "1000M Full Duplex"
+    assert state.attributes["new_speed"] == "Disconnected"
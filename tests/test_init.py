@@ -1,14 +1,52 @@
 """Test integration setup and unload."""
 
-from unittest.mock import MagicMock
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock, patch
 
 import pytest
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    STATE_UNAVAILABLE,
+)
 from homeassistant.core import HomeAssistant
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from py_mercury_switch_api import MercurySwitchConnectionError
+from py_mercury_switch_api.exceptions import NotLoggedInError
+from py_mercury_switch_api.models import MercurySwitchModelNotDetectedError, SG108Pro
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
 
-from custom_components.mercury_switch.const import DOMAIN
+from custom_components.mercury_switch.const import (
+    CIRCUIT_BREAKER_COOLDOWN,
+    CIRCUIT_BREAKER_THRESHOLD,
+    CIRCUIT_CLOSED,
+    CIRCUIT_OPEN,
+    CONF_ASYNC_TRANSPORT,
+    CONF_MODEL,
+    CONF_PORTS,
+    DOMAIN,
+    SCAN_INTERVAL,
+    SLOW_SCAN_INTERVAL,
+    SNAPSHOT_SAVE_DELAY,
+    TIER_FAST,
+    TIER_PAGES,
+    TIER_SLOW,
+)
+from custom_components.mercury_switch.mercury_entities import (
+    MercurySwitchRouterSensorEntity,
+)
 
 
 @pytest.fixture
@@ -76,3 +114,591 @@ async def test_unload_entry(
     await hass.async_block_till_done()
 
     assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_unchanged_state_is_not_written(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_switch_pages: dict[str, str],
+) -> None:
+    """Test that a refresh without changes skips the state writes."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_registry = er.async_get(hass)
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, "sg108pro_192_168_1_100-switch_firmware-0"
+    )
+    assert entity_id is not None
+    last_updated = hass.states.get(entity_id).last_updated
+
+    switch = mock_config_entry.runtime_data.switch
+    coordinator = mock_config_entry.runtime_data.coordinator_switch_infos
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert switch.skipped_state_writes > 0
+    assert hass.states.get(entity_id).last_updated == last_updated
+
+    mock_switch_pages["/SystemInfoRpm.htm"] = mock_switch_pages[
+        "/SystemInfoRpm.htm"
+    ].replace("1.0.0 Build 20180515 Rel.60767", "1.0.1 Build 20190101 Rel.12345")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state.state == "1.0.1 Build 20190101 Rel.12345"
+    assert state.last_updated != last_updated
+
+
+async def test_update_dispatched_to_changed_keys(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_switch_pages: dict[str, str],
+) -> None:
+    """Test that only the entities of changed keys are updated."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    switch = mock_config_entry.runtime_data.switch
+    coordinator = mock_config_entry.runtime_data.coordinator_switch_infos
+    mock_switch_pages["/SystemInfoRpm.htm"] = mock_switch_pages[
+        "/SystemInfoRpm.htm"
+    ].replace("1.0.0 Build 20180515 Rel.60767", "1.0.1 Build 20190101 Rel.12345")
+    updated: list[str] = []
+    with patch.object(
+        MercurySwitchRouterSensorEntity,
+        "async_update_device",
+        autospec=True,
+        side_effect=lambda entity: updated.append(entity.entity_description.key),
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert updated == ["switch_firmware"]
+    assert switch.skipped_state_writes > 0
+
+    # a failed poll changes the availability of all entities
+    entity_registry = er.async_get(hass)
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, "sg108pro_192_168_1_100-switch_hardware-0"
+    )
+    with patch.object(
+        coordinator, "_async_fetch", side_effect=ConnectionError("offline")
+    ):
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "SG108 Pro 1.0"
+
+
+async def test_publish_interval(
+    hass: HomeAssistant,
+    mock_mercury_switch_api: MagicMock,
+    mock_switch_pages: dict[str, str],
+) -> None:
+    """Test that counter changes are published at most every interval."""
+    entry = MockConfigEntry(
+        version=1,
+        domain=DOMAIN,
+        title="SG108Pro (192.168.1.100)",
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_USERNAME: "admin",
+            CONF_PASSWORD: "test",
+        },
+        options={"counters_publish_interval": 600},
+        unique_id="sg108pro_192_168_1_100",
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_registry = er.async_get(hass)
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, "sg108pro_192_168_1_100-port_1_tx_good-0"
+    )
+    assert hass.states.get(entity_id).state == "1000"
+
+    mock_switch_pages["/PortStatisticsRpm.htm"] = mock_switch_pages[
+        "/PortStatisticsRpm.htm"
+    ].replace("pkts:[1000,", "pkts:[1500,")
+    await entry.runtime_data.coordinator_port_infos.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "1000"
+
+    # the held back value is written when the interval is over
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=601))
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "1500"
+
+
+async def test_polling_tiers(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_page_fetcher: MagicMock,
+) -> None:
+    """Test that port and system infos are polled by separate coordinators."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    runtime_data = mock_config_entry.runtime_data
+    assert runtime_data.coordinator_port_infos.update_interval == SCAN_INTERVAL
+    assert runtime_data.coordinator_switch_infos.update_interval == SLOW_SCAN_INTERVAL
+    port_infos = runtime_data.coordinator_port_infos.data
+    switch_infos = runtime_data.coordinator_switch_infos.data
+    assert port_infos.ports.status(1) is True
+    assert port_infos.system.firmware is None
+    assert switch_infos.system.firmware is not None
+    assert switch_infos.vlans[10].name == "VLAN10"
+
+    mock_page_fetcher.request.reset_mock()
+    await runtime_data.coordinator_port_infos.async_refresh()
+
+    # the pages of a poll are fetched concurrently, in no particular order
+    fetched_urls = [call.args[1] for call in mock_page_fetcher.request.call_args_list]
+    assert sorted(fetched_urls) == [
+        "http://192.168.1.100/PortSettingRpm.htm",
+        "http://192.168.1.100/PortStatisticsRpm.htm",
+    ]
+
+
+async def test_poll_stats(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_switch_pages: dict[str, str],
+) -> None:
+    """Test that the timings and failures of polls are recorded."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    stats = mock_config_entry.runtime_data.switch.poll_stats
+    # the first poll of each tier
+    assert len(stats.latencies) == 2
+    assert len(stats.executor_waits) == 4
+    assert stats.error_rate == 0.0
+
+    del mock_switch_pages["/PortStatisticsRpm.htm"]
+    await mock_config_entry.runtime_data.coordinator_port_infos.async_refresh()
+
+    assert stats.failures == 1
+    assert stats.error_rate == 100 / 3
+
+
+async def test_concurrent_polls_coalesced(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_page_fetcher: MagicMock,
+) -> None:
+    """Test that overlapping polls share one fetch unless fresh data is asked for."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    switch = mock_config_entry.runtime_data.switch
+    fast_pages = len(TIER_PAGES[TIER_FAST])
+    requests = mock_page_fetcher.request.call_count
+    first, second, slow = await asyncio.gather(
+        switch.async_get_switch_infos(TIER_FAST),
+        switch.async_get_switch_infos(TIER_FAST),
+        switch.async_get_switch_infos(TIER_SLOW),
+    )
+    assert first is second
+    assert slow is not first
+    assert switch.poll_stats.coalesced == 1
+    assert mock_page_fetcher.request.call_count - requests == fast_pages + len(
+        TIER_PAGES[TIER_SLOW]
+    )
+
+    requests = mock_page_fetcher.request.call_count
+    shared, fresh = await asyncio.gather(
+        switch.async_get_switch_infos(TIER_FAST),
+        switch.async_get_switch_infos(TIER_FAST, fresh=True),
+    )
+    assert shared is not fresh
+    assert mock_page_fetcher.request.call_count - requests == 2 * fast_pages
+
+    # finished fetches are not shared, the next poll asks the switch again
+    requests = mock_page_fetcher.request.call_count
+    await switch.async_get_switch_infos(TIER_FAST)
+    assert mock_page_fetcher.request.call_count - requests == fast_pages
+
+
+async def test_request_timeout(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_page_fetcher: MagicMock,
+) -> None:
+    """Test that a page fetch taking longer than the request timeout fails the poll."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    switch = mock_config_entry.runtime_data.switch
+    coordinator = mock_config_entry.runtime_data.coordinator_port_infos
+    switch.timeout = 0.05
+    request = mock_page_fetcher.request.side_effect
+
+    def slow_request(*args: Any) -> Any:
+        time.sleep(0.3)
+        return request(*args)
+
+    mock_page_fetcher.request.side_effect = slow_request
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is False
+    assert switch.poll_stats.failures == 1
+    assert switch.circuit_breaker.failures == 1
+
+
+async def test_request_timeout_covers_relogin(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_page_fetcher: MagicMock,
+) -> None:
+    """Test that a re-login within a page fetch gets a timeout of its own."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    switch = mock_config_entry.runtime_data.switch
+    coordinator = mock_config_entry.runtime_data.coordinator_port_infos
+    switch.timeout = 0.1
+    request = mock_page_fetcher.request.side_effect
+    expired = [True]
+
+    def slow_request(*args: Any) -> Any:
+        time.sleep(0.06)
+        if expired:
+            expired.clear()
+            raise NotLoggedInError
+        return request(*args)
+
+    def slow_login() -> bool:
+        time.sleep(0.06)
+        return True
+
+    mock_page_fetcher.request.side_effect = slow_request
+    mock_mercury_switch_api.get_login_cookie.side_effect = slow_login
+    await coordinator.async_refresh()
+
+    # the request, re-login and retry took longer than one request timeout
+    assert coordinator.last_update_success is True
+    assert switch.session.relogin_count == 1
+    assert switch.circuit_breaker.failures == 0
+
+
+async def test_circuit_breaker(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_page_fetcher: MagicMock,
+    mock_switch_pages: dict[str, str],
+) -> None:
+    """Test that polls of an unreachable switch pause until the cooldown is over."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    switch = mock_config_entry.runtime_data.switch
+    coordinator = mock_config_entry.runtime_data.coordinator_port_infos
+    page = mock_switch_pages.pop("/PortStatisticsRpm.htm")
+    for _ in range(CIRCUIT_BREAKER_THRESHOLD):
+        await coordinator.async_refresh()
+    assert switch.circuit_breaker.state == CIRCUIT_OPEN
+
+    # the switch is back, but not asked until the cooldown is over
+    mock_switch_pages["/PortStatisticsRpm.htm"] = page
+    requests = mock_page_fetcher.request.call_count
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success is False
+    assert mock_page_fetcher.request.call_count == requests
+    assert switch.poll_stats.failures == CIRCUIT_BREAKER_THRESHOLD
+
+    switch.circuit_breaker.opened_at -= CIRCUIT_BREAKER_COOLDOWN.total_seconds()
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success is True
+    assert switch.circuit_breaker.state == CIRCUIT_CLOSED
+    assert switch.circuit_breaker.trips == 1
+
+
+@pytest.mark.usefixtures("mock_mercury_switch_api")
+async def test_missing_page_fails_poll_cleanly(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_switch_pages: dict[str, str],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that a page the switch does not serve fails the poll without traceback."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    del mock_switch_pages["/PortStatisticsRpm.htm"]
+    coordinator = mock_config_entry.runtime_data.coordinator_port_infos
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is False
+    assert "Unexpected error" not in caplog.text
+    assert "Traceback" not in caplog.text
+
+
+@pytest.mark.usefixtures("mock_mercury_switch_api")
+async def test_unreachable_switch_fails_poll_cleanly(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_page_fetcher: MagicMock,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that connection errors fail the poll without traceback."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    mock_page_fetcher.request.side_effect = MercurySwitchConnectionError("offline")
+    coordinator = mock_config_entry.runtime_data.coordinator_port_infos
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is False
+    assert "Unexpected error" not in caplog.text
+    assert "Traceback" not in caplog.text
+
+
+async def test_setup_entry_async_transport(
+    hass: HomeAssistant,
+    mock_mercury_switch_api: MagicMock,
+    mock_switch_pages: dict[str, str],
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test that the async transport polls the switch without the connector."""
+    entry = MockConfigEntry(
+        version=1,
+        domain=DOMAIN,
+        title="SG108Pro (192.168.1.100)",
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_USERNAME: "admin",
+            CONF_PASSWORD: "test",
+        },
+        options={CONF_ASYNC_TRANSPORT: True},
+        unique_id="sg108pro_192_168_1_100",
+    )
+    aioclient_mock.post(
+        "http://192.168.1.100/logon.cgi",
+        text="<script>var logonInfo = new Array(0, 0, 0);</script>",
+        cookies={"Authorization": "token"},
+    )
+    for path, page in mock_switch_pages.items():
+        aioclient_mock.get(f"http://192.168.1.100{path}", text=page)
+    entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    mock_mercury_switch_api.get_login_cookie.assert_not_called()
+    assert entry.runtime_data.switch.session.login_count == 1
+    assert entry.runtime_data.coordinator_port_infos.data.ports.status(1) is True
+    assert (
+        entry.runtime_data.coordinator_switch_infos.data.system.mac
+        == "00:AA:BB:CC:DD:EE"
+    )
+    # the session cookie of the login is sent with the page requests
+    _method, _url, _data, headers = aioclient_mock.mock_calls[-1]
+    assert headers["Cookie"] == "Authorization=token"
+
+
+async def test_device_profile_cached(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+) -> None:
+    """Test that the detected model is cached and reused on the next setup."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    mock_mercury_switch_api.autodetect_model.assert_called_once()
+    assert mock_config_entry.data[CONF_MODEL] == "SG108Pro"
+    assert mock_config_entry.data[CONF_PORTS] == 8
+    # caching the profile does not reload the entry
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+
+    mock_mercury_switch_api.autodetect_model.reset_mock()
+    await hass.config_entries.async_reload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    mock_mercury_switch_api.autodetect_model.assert_not_called()
+
+
+async def test_device_profile_replaced_on_mismatch(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_switch_pages: dict[str, str],
+) -> None:
+    """Test that a cached profile whose pages do not load is detected again."""
+
+    def autodetect_model() -> type[SG108Pro]:
+        mock_mercury_switch_api.switch_model = SG108Pro
+        mock_mercury_switch_api.ports = SG108Pro.PORTS
+        return SG108Pro
+
+    mock_mercury_switch_api.autodetect_model.side_effect = autodetect_model
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        data={**mock_config_entry.data, CONF_MODEL: "SG105E", CONF_PORTS: 5},
+    )
+    del mock_switch_pages["/PortSettingRpm.htm"]
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+    mock_mercury_switch_api.autodetect_model.assert_called_once()
+    assert mock_config_entry.data[CONF_MODEL] == "SG108Pro"
+    assert mock_config_entry.data[CONF_PORTS] == 8
+
+
+async def test_device_profile_kept_on_transient_failure(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_switch_pages: dict[str, str],
+) -> None:
+    """Test that a cached profile is kept while the switch cannot be detected."""
+    mock_mercury_switch_api.autodetect_model.side_effect = (
+        MercurySwitchModelNotDetectedError
+    )
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        data={**mock_config_entry.data, CONF_MODEL: "SG108Pro", CONF_PORTS: 8},
+    )
+    # e.g. server errors while the switch reboots
+    page = mock_switch_pages.pop("/PortSettingRpm.htm")
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+    mock_mercury_switch_api.autodetect_model.assert_called_once()
+    assert mock_config_entry.data[CONF_MODEL] == "SG108Pro"
+    assert mock_config_entry.data[CONF_PORTS] == 8
+
+    mock_switch_pages["/PortSettingRpm.htm"] = page
+    await hass.config_entries.async_reload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert mock_config_entry.runtime_data.switch.profile_unconfirmed is False
+
+
+async def test_snapshot_saved(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+) -> None:
+    """Test that the switch infos of both tiers are saved after a delay."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+
+    snapshot = hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"]["data"]
+    assert snapshot[TIER_SLOW]["switch_mac"] == "00:AA:BB:CC:DD:EE"
+    assert snapshot[TIER_FAST]["port_1_status"] == "on"
+
+
+async def test_startup_from_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api_auth_fail: MagicMock,
+) -> None:
+    """Test that entities start from the snapshot while the switch is offline."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        data={**mock_config_entry.data, CONF_MODEL: "SG108Pro", CONF_PORTS: 8},
+    )
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {
+            TIER_FAST: {"port_1_status": "on", "port_1_speed": "1000M"},
+            TIER_SLOW: {
+                "switch_firmware": "1.0.0",
+                "vlan_count": 1,
+                "vlan_10_name": "VLAN10",
+            },
+        },
+    }
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    entity_registry = er.async_get(hass)
+    assert entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, "sg108pro_192_168_1_100-vlan_10_name-0"
+    )
+    # the background refresh could not login
+    mock_mercury_switch_api_auth_fail.get_login_cookie.assert_called()
+    assert not mock_config_entry.runtime_data.coordinator_port_infos.last_update_success
+
+
+async def test_vlan_entities_follow_configuration(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_switch_pages: dict[str, str],
+) -> None:
+    """Test that VLAN entities are added and removed without a reload."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_registry = er.async_get(hass)
+    vlan_10_name = "sg108pro_192_168_1_100-vlan_10_name-0"
+    vlan_20_name = "sg108pro_192_168_1_100-vlan_20_name-0"
+    firmware_entity_id = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, "sg108pro_192_168_1_100-switch_firmware-0"
+    )
+    assert entity_registry.async_get_entity_id("sensor", DOMAIN, vlan_10_name)
+    assert not entity_registry.async_get_entity_id("sensor", DOMAIN, vlan_20_name)
+    firmware_state = hass.states.get(firmware_entity_id)
+
+    mock_switch_pages["/Vlan8021QRpm.htm"] = (
+        mock_switch_pages["/Vlan8021QRpm.htm"]
+        .replace("vids:[1,10]", "vids:[1,20]")
+        .replace('"VLAN10"', '"VLAN20"')
+    )
+    await mock_config_entry.runtime_data.coordinator_switch_infos.async_refresh()
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert not entity_registry.async_get_entity_id("sensor", DOMAIN, vlan_10_name)
+    entity_id = entity_registry.async_get_entity_id("sensor", DOMAIN, vlan_20_name)
+    assert hass.states.get(entity_id).state == "VLAN20"
+    # other entities are kept
+    assert hass.states.get(firmware_entity_id).context == firmware_state.context
@@ -0,0 +1,36 @@
+"""Test the poll statistics of the Mercury Switch integration."""
+
+from collections import deque
+
+from custom_components.mercury_switch.poll_stats import PollStats, percentile
+
+
+def test_percentile() -> None:
+    """Test the nearest-rank percentiles."""
+    values = deque(float(value) for value in range(1, 21))
+
+    assert percentile(values, 50) == 10.0
+    assert percentile(values, 95) == 19.0
+    assert percentile(values, 100) == 20.0
+    assert percentile(deque([3.0]), 95) == 3.0
+    assert percentile(deque(), 50) is None
+
+
+def test_poll_stats_rolling_window() -> None:
+    """Test that only the last polls count towards latency and error rate."""
+    stats = PollStats(size=4)
+    assert stats.last_latency is None
+    assert stats.error_rate is None
+
+    stats.record_poll(1.0, 0.0, failed=True)
+    stats.record_poll(0.5, 0.25, failed=False, retries=1)
+    assert stats.last_latency == 0.5
+    assert stats.error_rate == 50.0
+
+    for _ in range(4):
+        stats.record_poll(0.2, 0.0, failed=False)
+    assert stats.error_rate == 0.0
+    assert list(stats.latencies) == [0.2] * 4
+    # the totals are not limited to the window
+    assert stats.failures == 1
+    assert stats.retries == 1
@@ -0,0 +1,37 @@
+"""Test port packet rate computation for Mercury Switch integration."""
+
+from custom_components.mercury_switch.port_rates import PortRateTracker
+
+
+def test_rates_from_consecutive_snapshots() -> None:
+    """Test that rates are derived from counter deltas over fetch time."""
+    tracker = PortRateTracker()
+
+    rates = tracker.update({"port_1_tx_good": 1000, "port_1_rx_good": 2000}, 1, 10.0)
+    assert rates == {"port_1_tx_rate": None, "port_1_rx_rate": None}
+
+    rates = tracker.update({"port_1_tx_good": 1300, "port_1_rx_good": 2600}, 1, 40.0)
+    assert rates == {"port_1_tx_rate": 10.0, "port_1_rx_rate": 20.0}
+
+
+def test_rates_smoothing_window() -> None:
+    """Test that the window averages over several samples."""
+    tracker = PortRateTracker(window=3)
+
+    tracker.update({"port_1_tx_good": 0}, 1, 0.0)
+    tracker.update({"port_1_tx_good": 600}, 1, 30.0)
+    rates = tracker.update({"port_1_tx_good": 600}, 1, 60.0)
+
+    assert rates == {"port_1_tx_rate": 10.0}
+
+
+def test_rates_counter_reset() -> None:
+    """Test that a counter reset restarts the history instead of going negative."""
+    tracker = PortRateTracker()
+
+    tracker.update({"port_1_tx_good": 5000}, 1, 0.0)
+    rates = tracker.update({"port_1_tx_good": 10}, 1, 30.0)
+    assert rates == {"port_1_tx_rate": None}
+
+    rates = tracker.update({"port_1_tx_good": 310}, 1, 60.0)
+    assert rates == {"port_1_tx_rate": 10.0}
@@ -0,0 +1,59 @@
+"""Test the state publish policies of the Mercury Switch integration."""
+
+from custom_components.mercury_switch.publish_policy import (
+    PublishPolicy,
+    publish_policies,
+)
+
+
+def test_interval_policy() -> None:
+    """Test that an interval holds changes back until it elapsed."""
+    policy = PublishPolicy(interval=60)
+
+    assert not policy.should_publish(100, 200, 30)
+    assert policy.should_publish(100, 200, 60)
+
+
+def test_threshold_policy() -> None:
+    """Test that a threshold only publishes large enough relative changes."""
+    policy = PublishPolicy(threshold=10)
+
+    assert not policy.should_publish(1000, 1099, 0)
+    assert policy.should_publish(1000, 1100, 0)
+    assert policy.should_publish(1000, 900, 0)
+    assert policy.should_publish(0, 1, 0)
+    # values which are not numbers cannot be compared
+    assert policy.should_publish("100M Full", "1000M Full", 0)
+
+
+def test_interval_or_threshold_policy() -> None:
+    """Test that either an elapsed interval or a large change publishes."""
+    policy = PublishPolicy(interval=60, threshold=10)
+
+    assert not policy.should_publish(1000, 1050, 30)
+    assert policy.should_publish(1000, 1050, 60)
+    assert policy.should_publish(1000, 2000, 30)
+
+
+def test_publish_policies_from_options() -> None:
+    """Test that only the classes with a policy configured get one."""
+    policies = publish_policies(
+        {
+            "counters_publish_interval": 300,
+            "rates_publish_threshold": 5.0,
+            "link_speed_publish_interval": 0,
+        }
+    )
+
+    assert policies == {
+        "counters": PublishPolicy(interval=300),
+        "rates": PublishPolicy(threshold=5.0),
+    }
+
+
+def test_link_speed_threshold_ignored() -> None:
+    """Test that no threshold policy is built for the non-numeric port speed."""
+    assert publish_policies({"link_speed_publish_threshold": 10.0}) == {}
+    assert publish_policies(
+        {"link_speed_publish_interval": 60, "link_speed_publish_threshold": 10.0}
+    ) == {"link_speed": PublishPolicy(interval=60)}
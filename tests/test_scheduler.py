@@ -0,0 +1,92 @@
+"""Test the poll scheduler of the Mercury Switch integration."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mercury_switch.const import (
+    DOMAIN,
+    SCAN_INTERVAL,
+    TIER_FAST,
+    TIER_SLOW,
+)
+from custom_components.mercury_switch.scheduler import (
+    MercurySwitchPollScheduler,
+    get_scheduler,
+    poll_phase,
+)
+
+
+def _config_entry(entry_id: str) -> MockConfigEntry:
+    """Create a mock config entry of the test switch."""
+    return MockConfigEntry(
+        version=1,
+        domain=DOMAIN,
+        title=f"SG108Pro ({entry_id})",
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_USERNAME: "admin",
+            CONF_PASSWORD: "test",
+        },
+        unique_id=f"sg108pro_{entry_id}",
+        entry_id=entry_id,
+    )
+
+
+def test_poll_phase_spreads_slots() -> None:
+    """Test that consecutive slots split the interval evenly."""
+    assert [poll_phase(slot) for slot in range(6)] == [
+        0.0,
+        0.5,
+        0.25,
+        0.75,
+        0.125,
+        0.625,
+    ]
+
+
+def test_register_reuses_released_slots() -> None:
+    """Test that slots are kept per entry and reused once released."""
+    scheduler = MercurySwitchPollScheduler()
+    interval = timedelta(seconds=40)
+
+    assert scheduler.register(TIER_FAST, "a", interval) == timedelta(0)
+    assert scheduler.register(TIER_FAST, "b", interval) == timedelta(seconds=20)
+    assert scheduler.register(TIER_FAST, "c", interval) == timedelta(seconds=10)
+    # tiers are staggered independently
+    assert scheduler.register(TIER_SLOW, "c", interval) == timedelta(0)
+    # registering again keeps the slot
+    assert scheduler.register(TIER_FAST, "b", interval) == timedelta(seconds=20)
+
+    scheduler.unregister(TIER_FAST, "b")
+    assert scheduler.register(TIER_FAST, "d", interval) == timedelta(seconds=20)
+
+
+async def test_switch_polls_are_staggered(
+    hass: HomeAssistant,
+    mock_mercury_switch_api: MagicMock,
+) -> None:
+    """Test that the second switch polls half an interval after the first."""
+    entries = [_config_entry("first"), _config_entry("second")]
+    for entry in entries:
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    first, second = (entry.runtime_data.coordinator_port_infos for entry in entries)
+    assert first.update_interval == SCAN_INTERVAL
+    assert second.update_interval == SCAN_INTERVAL * 1.5
+
+    # the offset only delays the first scheduled poll, an early poll has no lag
+    await second.async_refresh()
+    assert second.update_interval == SCAN_INTERVAL
+    assert entries[1].runtime_data.switch.poll_lag == 0.0
+
+    # unloading releases the slot for the next switch
+    await hass.config_entries.async_unload(entries[1].entry_id)
+    await hass.async_block_till_done()
+    scheduler = get_scheduler(hass)
+    assert scheduler.register(TIER_FAST, "third", SCAN_INTERVAL) == SCAN_INTERVAL / 2
@@ -9,7 +9,13 @@ from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.mercury_switch.const import DOMAIN
-from custom_components.mercury_switch.sensor import async_setup_entry
+from custom_components.mercury_switch.sensor import (
+    PORT_TEMPLATE,
+    async_setup_entry,
+    port_sensor_descriptions,
+    vlan_sensor_descriptions,
+)
+from custom_components.mercury_switch.snapshot import SwitchSnapshot
 
 
 @pytest.fixture
@@ -89,7 +95,7 @@ async def test_sensor_entities_created(
         update_method=AsyncMock(return_value=mock_switch_infos),
         config_entry=mock_config_entry,
     )
-    coordinator.data = mock_switch_infos
+    coordinator.data = SwitchSnapshot.from_switch_infos(mock_switch_infos)
 
     mock_config_entry.runtime_data = MercurySwitchData(switch, coordinator)
 
@@ -115,6 +121,8 @@ async def test_sensor_entities_created(
     assert "port_1_speed" in entity_keys
     assert "port_1_tx_good" in entity_keys
     assert "port_1_rx_good" in entity_keys
+    assert "port_1_tx_rate" in entity_keys
+    assert "port_1_rx_rate" in entity_keys
 
     # Check for VLAN sensors
     assert "vlan_type" in entity_keys
@@ -150,7 +158,7 @@ async def test_sensor_values(
         update_method=AsyncMock(return_value=mock_switch_infos),
         config_entry=mock_config_entry,
     )
-    coordinator.data = mock_switch_infos
+    coordinator.data = SwitchSnapshot.from_switch_infos(mock_switch_infos)
 
     mock_config_entry.runtime_data = MercurySwitchData(switch, coordinator)
 
@@ -184,3 +192,18 @@ async def test_sensor_values(
     assert vlan_count_entity is not None
     vlan_count_entity.async_update_device()
     assert vlan_count_entity.native_value == 7
+
+
+def test_descriptions_shared() -> None:
+    """Test that port and VLAN descriptions are built once and shared."""
+    descriptions = port_sensor_descriptions(8)
+
+    assert port_sensor_descriptions(8) is descriptions
+    assert len(descriptions) == 8 * len(PORT_TEMPLATE)
+    assert descriptions[0].key == "port_1_speed"
+    assert descriptions[-1].name == "Port 8 RX Rate"
+    # a larger switch reuses the descriptions of the first ports
+    assert port_sensor_descriptions(24)[: len(descriptions)] == descriptions
+    assert port_sensor_descriptions(24)[0] is descriptions[0]
+    assert vlan_sensor_descriptions(10) is vlan_sensor_descriptions(10)
+    assert vlan_sensor_descriptions(10)[0].key == "vlan_10_name"
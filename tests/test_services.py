@@ -0,0 +1,87 @@
+"""Test the services of the Mercury Switch integration."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mercury_switch.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_CYCLES,
+    ATTR_TOP,
+    DOMAIN,
+    SERVICE_PROFILE,
+)
+
+
+@pytest.fixture
+def mock_config_entry() -> MockConfigEntry:
+    """Create a mock config entry."""
+    return MockConfigEntry(
+        version=1,
+        domain=DOMAIN,
+        title="SG108Pro (192.168.1.100)",
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_USERNAME: "admin",
+            CONF_PASSWORD: "test",
+        },
+        unique_id="sg108pro_192_168_1_100",
+    )
+
+
+async def test_profile_service(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+    mock_page_fetcher: MagicMock,
+    tmp_path: Path,
+) -> None:
+    """Test that the profile service polls the switch and saves the stats."""
+    hass.config.config_dir = str(tmp_path)
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    mock_page_fetcher.request.reset_mock()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE,
+        {ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id, ATTR_CYCLES: 2, ATTR_TOP: 5},
+        blocking=True,
+        return_response=True,
+    )
+
+    # both tiers, all four pages, twice
+    assert mock_page_fetcher.request.call_count == 8
+    assert response["cycles"] == 2
+    assert Path(response["file"]).parent == tmp_path
+    assert await hass.async_add_executor_job(Path(response["file"]).is_file)
+    assert len(response["top_functions"]) == 5
+    assert {"function", "calls", "own_seconds", "cumulative_seconds"} == set(
+        response["top_functions"][0]
+    )
+
+
+async def test_profile_service_unknown_entry(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_mercury_switch_api: MagicMock,
+) -> None:
+    """Test that profiling an unknown entry is rejected."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROFILE,
+            {ATTR_CONFIG_ENTRY_ID: "unknown"},
+            blocking=True,
+            return_response=True,
+        )
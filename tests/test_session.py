@@ -0,0 +1,98 @@
+"""Test the login session of the Mercury Switch integration."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from py_mercury_switch_api.exceptions import NotLoggedInError
+from py_mercury_switch_api.models import SG108Pro
+
+from custom_components.mercury_switch.errors import CannotLoginError
+from custom_components.mercury_switch.session import MercurySwitchSession
+
+
+@pytest.fixture
+def mock_connector() -> MagicMock:
+    """Create a mocked connector which logs in successfully."""
+    connector = MagicMock()
+    connector.host = "192.168.1.100"
+    connector.get_login_cookie = MagicMock(return_value=True)
+    connector.switch_model = SG108Pro
+    return connector
+
+
+def test_session_logs_in_once(
+    mock_connector: MagicMock, mock_page_fetcher: MagicMock
+) -> None:
+    """Test that the login is reused by consecutive fetches."""
+    session = MercurySwitchSession(mock_connector)
+
+    for _ in range(3):
+        response = session.fetch_page_from_templates(SG108Pro.SYSTEM_INFO_TEMPLATES)
+        assert "info_ds" in response.text
+
+    assert mock_connector.get_login_cookie.call_count == 1
+    assert session.login_count == 1
+    assert session.relogin_count == 0
+    assert session.session_age is not None
+
+
+def test_session_relogin_on_expiry(
+    mock_connector: MagicMock, mock_page_fetcher: MagicMock
+) -> None:
+    """Test that an expired session logs in again within the same fetch."""
+    session = MercurySwitchSession(mock_connector)
+    session.login()
+
+    request = mock_page_fetcher.request.side_effect
+    calls = []
+
+    def expire_once(*args: object) -> object:
+        calls.append(args)
+        if len(calls) == 1:
+            raise NotLoggedInError
+        return request(*args)
+
+    mock_page_fetcher.request.side_effect = expire_once
+    response = session.fetch_page_from_templates(SG108Pro.SYSTEM_INFO_TEMPLATES)
+
+    assert "info_ds" in response.text
+    assert session.login_count == 2
+    assert session.relogin_count == 1
+
+
+def test_session_login_failure(
+    mock_connector: MagicMock, mock_page_fetcher: MagicMock
+) -> None:
+    """Test that a rejected login raises CannotLoginError."""
+    mock_connector.get_login_cookie.return_value = False
+    session = MercurySwitchSession(mock_connector)
+
+    with pytest.raises(CannotLoginError):
+        session.fetch_page_from_templates(SG108Pro.SYSTEM_INFO_TEMPLATES)
+    assert session.session_age is None
+
+
+def test_session_no_double_relogin(
+    mock_connector: MagicMock, mock_page_fetcher: MagicMock
+) -> None:
+    """Test that an expiry already handled by a concurrent fetch is only retried."""
+    session = MercurySwitchSession(mock_connector)
+    session.login()
+
+    request = mock_page_fetcher.request.side_effect
+    calls = []
+
+    def expire_while_other_fetch_relogins(*args: object) -> object:
+        calls.append(args)
+        if len(calls) == 1:
+            # a concurrent page fetch logs in again before this one notices
+            session.login()
+            raise NotLoggedInError
+        return request(*args)
+
+    mock_page_fetcher.request.side_effect = expire_while_other_fetch_relogins
+    response = session.fetch_page_from_templates(SG108Pro.SYSTEM_INFO_TEMPLATES)
+
+    assert "info_ds" in response.text
+    assert session.login_count == 2
+    assert session.relogin_count == 0
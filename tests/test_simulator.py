@@ -0,0 +1,145 @@
+"""Test the integration end to end against the simulated switch."""
+
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mercury_switch.const import (
+    CONF_ASYNC_TRANSPORT,
+    CONF_REQUEST_TIMEOUT,
+    DOMAIN,
+)
+
+from .simulator import MercurySwitchSimulator, SimulatedVlan, SimulatorConfig
+
+
+@pytest.fixture
+async def simulator(socket_enabled: None) -> AsyncIterator[MercurySwitchSimulator]:
+    """Start a simulated 8-port switch with two VLANs on localhost."""
+    simulator = MercurySwitchSimulator(
+        SimulatorConfig(
+            vlans=[
+                SimulatedVlan(1, "Default", [], [1, 2, 3, 4, 5, 6, 7, 8]),
+                SimulatedVlan(10, "VLAN10", [1, 7], []),
+            ],
+            down_ports={2},
+            seed=0,
+        )
+    )
+    await simulator.async_start()
+    yield simulator
+    await simulator.async_stop()
+
+
+def simulated_entry(
+    simulator: MercurySwitchSimulator, options: dict[str, Any] | None = None
+) -> MockConfigEntry:
+    """Return a config entry of the simulated switch."""
+    return MockConfigEntry(
+        version=1,
+        domain=DOMAIN,
+        title="SG108Pro (simulator)",
+        data={
+            CONF_HOST: simulator.host,
+            CONF_USERNAME: simulator.config.username,
+            CONF_PASSWORD: simulator.config.password,
+        },
+        options=options or {},
+        unique_id="sg108pro_simulator",
+    )
+
+
+@pytest.mark.parametrize("options", [{}, {CONF_ASYNC_TRANSPORT: True}])
+async def test_simulated_switch(
+    hass: HomeAssistant, simulator: MercurySwitchSimulator, options: dict[str, Any]
+) -> None:
+    """Test that the switch is detected, logged in to and polled over HTTP."""
+    entry = simulated_entry(simulator, options)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert simulator.logins == 1
+    assert entry.runtime_data.switch.model == "SG108Pro"
+    port_infos = entry.runtime_data.coordinator_port_infos.data
+    assert port_infos.ports.status(1) is True
+    assert port_infos.ports.status(2) is False
+    switch_infos = entry.runtime_data.coordinator_switch_infos.data
+    assert switch_infos.vlans[10].tagged_ports == "1, 7"
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_simulated_session_expiry(
+    hass: HomeAssistant, simulator: MercurySwitchSimulator
+) -> None:
+    """Test that an expired session is renewed once within a poll."""
+    entry = simulated_entry(simulator)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    simulator.expire_sessions()
+    simulator.set_link(2, up=True)
+    coordinator = entry.runtime_data.coordinator_port_infos
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert simulator.logins == 2
+    assert entry.runtime_data.switch.session.relogin_count == 1
+    assert coordinator.data.ports.status(2) is True
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_simulated_errors(
+    hass: HomeAssistant, simulator: MercurySwitchSimulator
+) -> None:
+    """Test that server errors fail the poll and are counted."""
+    entry = simulated_entry(simulator)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    simulator.config.error_rate = 1.0
+    coordinator = entry.runtime_data.coordinator_port_infos
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert simulator.injected_errors > 0
+    assert entry.runtime_data.switch.poll_stats.failures == 1
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_simulated_hang(
+    hass: HomeAssistant, simulator: MercurySwitchSimulator
+) -> None:
+    """Test that a page left unanswered fails the poll after the request timeout."""
+    entry = simulated_entry(
+        simulator, {CONF_ASYNC_TRANSPORT: True, CONF_REQUEST_TIMEOUT: 1}
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    simulator.config.hang_rate = 1.0
+    # the simulator waits for hanging requests when stopped
+    simulator.config.hang_seconds = 3.0
+    coordinator = entry.runtime_data.coordinator_port_infos
+    started = time.monotonic()
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert time.monotonic() - started < simulator.config.hang_seconds
+    assert simulator.injected_hangs > 0
+    assert entry.runtime_data.switch.circuit_breaker.failures == 1
+
+    await hass.config_entries.async_unload(entry.entry_id)
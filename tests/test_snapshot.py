@@ -0,0 +1,87 @@
+"""Test the switch snapshot of the Mercury Switch integration."""
+
+from custom_components.mercury_switch.snapshot import (
+    SwitchSnapshot,
+    value_getter,
+)
+
+SWITCH_INFOS = {
+    "switch_mac": "00:AA:BB:CC:DD:EE",
+    "switch_firmware": "1.0.0 Build 20180515 Rel.60767",
+    "switch_ports": 8,
+    "port_1_state": "on",
+    "port_1_status": "on",
+    "port_1_speed": "1000M",
+    "port_1_tx_good": 1000,
+    "port_1_tx_rate": 12.5,
+    "port_2_status": "off",
+    "vlan_enabled": True,
+    "vlan_type": "802.1Q",
+    "vlan_count": 2,
+    "vlan_1_name": "Default",
+    "vlan_10_name": "VLAN10",
+    "vlan_10_tagged_ports": "1, 7",
+}
+
+
+def test_snapshot_from_switch_infos() -> None:
+    """Test that the flat switch infos are parsed into typed tables."""
+    snapshot = SwitchSnapshot.from_switch_infos(SWITCH_INFOS)
+
+    assert snapshot.system.mac == "00:AA:BB:CC:DD:EE"
+    assert snapshot.system.ports == 8
+    assert snapshot.ports.get(1, "state") is True
+    assert snapshot.ports.status(1) is True
+    assert snapshot.ports.get(1, "tx_good") == 1000
+    assert snapshot.ports.get(1, "tx_bad") is None
+    assert snapshot.ports.get(1, "tx_rate") == 12.5
+    assert snapshot.ports.status(2) is False
+    assert snapshot.vlan_type == "802.1Q"
+    assert snapshot.vlans[10].tagged_ports == "1, 7"
+    assert snapshot.vlan_ids == {1, 10}
+    assert snapshot == SwitchSnapshot.from_switch_infos(dict(SWITCH_INFOS))
+
+
+def test_snapshot_updated_in_place() -> None:
+    """Test that a poll updates the port arrays in place and reports changes."""
+    snapshot = SwitchSnapshot.from_switch_infos(SWITCH_INFOS)
+    counters = snapshot.ports.counters["tx_good"]
+
+    change = snapshot.update({"port_1_tx_good": 1000, "port_1_status": "on"})
+    assert not change.changed
+    assert not change.link_changed
+
+    change = snapshot.update({"port_1_tx_good": 2000, "port_2_status": "on"})
+    assert change.changed
+    assert change.link_changed
+    assert snapshot.ports.counters["tx_good"] is counters
+    assert snapshot.ports.get(1, "tx_good") == 2000
+    assert snapshot.ports.get(1, "speed") == "1000M"
+    assert snapshot.vlans[10].name == "VLAN10"
+
+    # new ports grow the arrays, a first status is no link change
+    change = snapshot.update({"port_48_status": "on"})
+    assert not change.link_changed
+    assert len(snapshot.ports) == 48
+    assert snapshot.ports.status(48) is True
+    assert snapshot.ports.status(47) is None
+
+
+def test_snapshot_without_vlans() -> None:
+    """Test that VLAN names are ignored while no VLAN is configured."""
+    snapshot = SwitchSnapshot.from_switch_infos({**SWITCH_INFOS, "vlan_count": 0})
+
+    assert snapshot.vlan_ids == set()
+
+
+def test_value_getter() -> None:
+    """Test that switch infos keys are read from the snapshot."""
+    snapshot = SwitchSnapshot.from_switch_infos(SWITCH_INFOS)
+
+    assert value_getter("switch_firmware")(snapshot) == SWITCH_INFOS["switch_firmware"]
+    assert value_getter("port_1_speed")(snapshot) == "1000M"
+    assert value_getter("port_2_status")(snapshot) is False
+    assert value_getter("port_3_status")(snapshot) is None
+    assert value_getter("vlan_10_name")(snapshot) == "VLAN10"
+    assert value_getter("vlan_20_name")(snapshot) is None
+    assert value_getter("vlan_count")(snapshot) == 2